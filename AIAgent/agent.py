@@ -5,6 +5,7 @@ import uvicorn
 from pydantic import BaseModel, Field
 from typing import Any, Optional, List, Dict, Union
 from qdrant_client import QdrantClient
+from qdrant_client.http import models
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.messages import SystemMessage
 from langchain_qdrant import QdrantVectorStore
@@ -12,16 +13,48 @@ from langchain.chains import create_retrieval_chain
 from langchain.chains.combine_documents import create_stuff_documents_chain
 from pathlib import Path
 from contextlib import asynccontextmanager
+from dataclasses import dataclass
+import asyncio
 import json
-import datetime
+import logging
+import logging.handlers
+import orjson
+import queue
+import re
+import time
+import hashlib
+import threading
 import os
+import sqlite3
+import requests
+import zstandard
+from requests.adapters import HTTPAdapter
+from urllib3.util import Retry
 # Change the working directory to the project root
 os.chdir(os.path.dirname(os.path.abspath(__file__)))
 
-from utils.factory_llm import LLMExecutorFactory, LLMExecutor
+from utils.factory_llm import LLMExecutorFactory, LLMExecutor, close_async_http
 from utils.factory_embedding import EmbeddingModelFactory, EmbeddingModel
-from utils.util_mongodb import MongoDBHandler
+from utils.util_mongodb import MongoDBHandler, AsyncMongoDBHandler
 from utils.factory_reportid import ReportIDFactory
+from utils.endpoint import endpoint_rpa_url
+
+@dataclass(frozen=True)
+class ExecutorSnapshot:
+    """
+    Immutable view of the active LLM executor.
+    
+    The snapshot is replaced as a whole when the model is switched, so readers that
+    grab APP_STATE.snapshot once always see an executor, type and LLM that belong together.
+    
+    Attributes:
+        executor: The active LLM executor instance
+        model_type: The type of the active LLM executor
+        llm: The LangChain model obtained from the executor, used for analysis tasks
+    """
+    executor: Optional[LLMExecutor] = None
+    model_type: str = ''
+    llm: Any = None
 
 # Application state management
 class AppState:
@@ -31,28 +64,118 @@ class AppState:
     Attributes:
         factory_llm: Factory for creating LLM executors
         factory_embedding: Factory for creating embedding models
-        current_executor: The currently active LLM executor instance
-        current_executor_type: The type of the currently active LLM executor
+        snapshot: Snapshot of the currently active LLM executor, its type and its LLM
+        snapshot_lock: Lock serializing snapshot replacement
         sysmsg_logpreviewer: System prompt for log previewing tasks
         sysmsg_loganalyzer: System prompt for log analysis safety checks
         sysmsg_qrt: System prompt for quick response team execution
-        llm: The current LLM executor instance used for analysis tasks
         mongo_handler: MongoDB handler instance for database operations
+        async_mongo_handler: Asyncio MongoDB handler used by the background writer
         report_id_factory: Singleton instance of ReportIDFactory for generating report IDs
+        event_loop: The event loop serving the application, used to hand work over from worker threads
+        mongo_write_queue: Queue of (collection_name, document) pairs waiting to be written to MongoDB
+        mongo_writer: Background task draining mongo_write_queue in batches
+        in_flight: Running log analyses keyed by request fingerprint, shared by identical concurrent requests
+        in_flight_lock: Lock guarding in_flight
+        rpa_session: Pooled HTTP session used by QRT threads to post alerts to the RPA endpoint
+        analysis_cache: SQLite database of analysis results of uploaded log files, None if disabled
+        analysis_cache_lock: Lock serializing access to analysis_cache
     """
     def __init__(self):
         self.factory_llm: None = None
         self.factory_embedding: None = None
-        self.current_executor: None = None
-        self.current_executor_type: str = ''
+        self.snapshot: ExecutorSnapshot = ExecutorSnapshot()
+        self.snapshot_lock: threading.RLock = threading.RLock()
         self.sysmsg_logpreviewer: str | None = None
         self.sysmsg_loganalyzer: str | None = None
         self.sysmsg_qrt: str | None = None
-        self.llm: None = None
         self.mongo_handler: None = None
+        self.async_mongo_handler: AsyncMongoDBHandler | None = None
         self.report_id_factory: ReportIDFactory = ReportIDFactory()
+        self.event_loop: asyncio.AbstractEventLoop | None = None
+        self.mongo_write_queue: asyncio.Queue | None = None
+        self.mongo_writer: asyncio.Task | None = None
+        self.in_flight: dict[str, asyncio.Future] = {}
+        self.in_flight_lock: asyncio.Lock = asyncio.Lock()
+        self.rpa_session: requests.Session | None = None
+        self.analysis_cache: sqlite3.Connection | None = None
+        self.analysis_cache_lock: threading.Lock = threading.Lock()
 APP_STATE = AppState()
 
+# Matches the body of a fenced ``` / ```json block in an LLM reply
+_JSON_FENCE = re.compile(r"```(?:json)?\s*(.*?)```", re.S)
+
+# MongoDB write batching: flush when this many documents are queued or after the interval (seconds)
+MONGO_WRITE_BATCH_SIZE = 50
+MONGO_WRITE_FLUSH_INTERVAL = 1.0
+# Queued at shutdown: the writer flushes its current batch and exits when it reaches this marker
+MONGO_WRITE_STOP = None
+
+# Prompt budget (characters) for the log analysis request, roughly 4 characters per token;
+# retrieved documents are trimmed so that the whole prompt stays within it
+LLM_CONTEXT_CHARS = int(os.environ.get("LLM_CONTEXT_CHARS", 32000))
+MIN_DOC_CHARS = 500
+
+# Log file uploads
+ALLOWED_LOG_EXTENSIONS = ['.txt', '.csv', '.json', '.log', 'md']
+MAX_UPLOAD_BATCH_FILES = 20
+# Log files may be uploaded zstd-compressed as '<name><ext>.zst'
+ZSTD_EXTENSION = '.zst'
+MAX_DECOMPRESSED_LOG_BYTES = 100 * 1024 * 1024
+# Set ANALYSIS_CACHE=1 to reuse the analysis of an identical log file uploaded before (also across restarts)
+ANALYSIS_CACHE_ENABLED = os.environ.get("ANALYSIS_CACHE") == "1"
+ANALYSIS_CACHE_PATH = Path("logs") / ".analysis_cache.db"
+
+# RPA alert requests: (connect, read) timeout in seconds
+RPA_REQUEST_TIMEOUT = (5, 120)
+
+# Level of the logging module's output (the utils modules log per-call details at DEBUG)
+LOG_LEVEL = os.environ.get("LOG_LEVEL", "INFO").upper()
+
+# Number of server worker processes; each has its own APP_STATE, so the active model
+# (and the in-flight and report ID state) is only consistent with a single worker
+WEB_CONCURRENCY = int(os.environ.get("WEB_CONCURRENCY", 1))
+
+def _start_logging() -> logging.handlers.QueueListener:
+    """
+    Route logging records through a queue to a listener thread that writes them to stderr.
+    
+    Logging calls then only enqueue the record, so formatting and I/O never run on the event loop.
+    
+    Returns:
+        logging.handlers.QueueListener: The started listener, to be stopped on shutdown
+    """
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    stream_handler = logging.StreamHandler()
+    stream_handler.setFormatter(logging.Formatter("%(asctime)s - %(levelname)s - %(name)s - %(message)s"))
+    listener = logging.handlers.QueueListener(log_queue, stream_handler)
+    listener.start()
+    
+    root = logging.getLogger()
+    root.handlers[:] = [logging.handlers.QueueHandler(log_queue)]
+    root.setLevel(LOG_LEVEL)
+    return listener
+
+def _create_rpa_session() -> requests.Session:
+    """
+    Create the pooled HTTP session used to post alerts to the RPA endpoint.
+    
+    Connections are kept alive and reused across QRT threads. Only connection failures are
+    retried, since a POST that reached the RPA service may already have sent an alert.
+    
+    Returns:
+        requests.Session: The configured session
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=16,
+        pool_maxsize=16,
+        max_retries=Retry(total=3, backoff_factor=0.2, status_forcelist=[502, 503, 504])
+    )
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """
@@ -63,14 +186,16 @@ async def lifespan(app: FastAPI):
     Args:
         app (FastAPI): The FastAPI application instance.
     """
+    log_listener = _start_logging()
     try:
-        # Initialize the LLM and embedding factories
+        # Initialize the LLM and embedding factories and the MongoDB handler; the embedding factory
+        # and the handler each fetch their configuration from the Message Center, so construct them
+        # on worker threads to overlap the round trips (the LLM configuration is fetched on first use)
         APP_STATE.factory_llm = LLMExecutorFactory()
-        APP_STATE.factory_embedding = EmbeddingModelFactory()
-
-        # Set the current executor and type based on the embedding factory
-        APP_STATE.current_executor = None
-        APP_STATE.current_executor_type = APP_STATE.factory_embedding.get_current_model()
+        APP_STATE.factory_embedding, APP_STATE.mongo_handler = await asyncio.gather(
+            asyncio.to_thread(EmbeddingModelFactory),
+            asyncio.to_thread(MongoDBHandler)
+        )
 
         # Load system prompt messages
         def _load_system_message(path: Path) -> str:
@@ -107,24 +232,61 @@ async def lifespan(app: FastAPI):
         APP_STATE.sysmsg_qrt = _load_system_message(sysmsg_QRT)
         print(f"- INFO - agent.py lifespan() - System prompt messages loaded.")
     except Exception as e:
-        print(f"- ERROR - agent.py lifespan() - Failed to load system prompt messages: {e}")
-        raise RuntimeError("Failed to load system prompt messages, application cannot start.") from e
+        print(f"- ERROR - agent.py lifespan() - Failed to initialize factories or load system prompt messages: {e}")
+        raise RuntimeError("Failed to initialize factories or load system prompt messages, application cannot start.") from e
         
     # Initialize LLM for analysis tasks
-    # Get the executor and then get the actual LangChain model from it
-    APP_STATE.llm = _get_executor(APP_STATE.current_executor_type).get_model()
+    # Use the executor type configured by the embedding factory and get the actual LangChain model from it
+    _activate_executor(APP_STATE.factory_embedding.get_current_model())
     print(f"- INFO - agent.py lifespan() - Agent executors initialized.")
 
-    # Initialize MongoDB handler
-    APP_STATE.mongo_handler = MongoDBHandler()  # Initialize MongoDB handler
+    # Initialize the async MongoDB handler; its configuration comes from the cache filled by MongoDBHandler
+    APP_STATE.async_mongo_handler = AsyncMongoDBHandler()
+    await APP_STATE.async_mongo_handler.connect()
     print(f"- INFO - agent.py lifespan() - MongoDB handler initialized.")
 
     # Initialize ReportIDFactory
     APP_STATE.report_id_factory = ReportIDFactory(APP_STATE.mongo_handler)
     print(f"- INFO - agent.py lifespan() - ReportIDFactory initialized.")
 
+    # Start the background MongoDB writer
+    APP_STATE.event_loop = asyncio.get_running_loop()
+    APP_STATE.mongo_write_queue = asyncio.Queue()
+    APP_STATE.mongo_writer = asyncio.create_task(_mongo_write_worker())
+    print(f"- INFO - agent.py lifespan() - MongoDB background writer started.")
+
+    # Create the pooled session for RPA alerts
+    APP_STATE.rpa_session = _create_rpa_session()
+
+    # Open the analysis cache of uploaded log files if enabled
+    if ANALYSIS_CACHE_ENABLED:
+        ANALYSIS_CACHE_PATH.parent.mkdir(exist_ok=True)
+        APP_STATE.analysis_cache = sqlite3.connect(ANALYSIS_CACHE_PATH, check_same_thread=False)
+        APP_STATE.analysis_cache.execute("CREATE TABLE IF NOT EXISTS results (hash TEXT PRIMARY KEY, result TEXT)")
+        print(f"- INFO - agent.py lifespan() - Analysis cache opened: {ANALYSIS_CACHE_PATH}")
+
     yield
 
+    # Stop the writer once it has flushed the documents it holds, then write whatever was queued after the stop marker
+    APP_STATE.mongo_write_queue.put_nowait(MONGO_WRITE_STOP)
+    try:
+        await APP_STATE.mongo_writer
+    except Exception as e:
+        print(f"- ERROR - agent.py lifespan() - MongoDB background writer failed: {str(e)}")
+    pending: Dict[str, List[Dict[str, Any]]] = {}
+    while not APP_STATE.mongo_write_queue.empty():
+        collection_name, document = APP_STATE.mongo_write_queue.get_nowait()
+        pending.setdefault(collection_name, []).append(document)
+    await _flush_mongo_batches(pending)
+    await APP_STATE.async_mongo_handler.close_connection()
+    print(f"- INFO - agent.py lifespan() - MongoDB background writer stopped.")
+
+    APP_STATE.rpa_session.close()
+    await close_async_http()
+    if APP_STATE.analysis_cache is not None:
+        APP_STATE.analysis_cache.close()
+    log_listener.stop()
+
 # Initialize FastAPI application with metadata
 app = FastAPI(title="AI SIEM Log Analysis API", 
               description="API for analyzing logs using different LLM models", 
@@ -137,6 +299,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    max_age=86400,  # Browsers may reuse a preflight result for a day
 )
 
 class LogAnalysisRequest(BaseModel):
@@ -147,10 +310,12 @@ class LogAnalysisRequest(BaseModel):
         logs: The raw log data to be analyzed by the LLM
         collection_name: Optional Qdrant collection name to search in
         top_k: Optional number of similar documents to retrieve from Qdrant
+        hnsw_ef: Optional HNSW search beam width used by Qdrant (lower is faster, higher is more accurate)
     """
     logs: str = Field(..., description="The logs to analyze")
     collection_name: Optional[str] = Field(None, description="The Qdrant collection name to search in")
     top_k: Optional[int] = Field(3, description="The number of similar documents to retrieve from Qdrant")
+    hnsw_ef: Optional[int] = Field(64, ge=1, description="The HNSW 'ef' search parameter used for the Qdrant similarity search")
     
 class ModelInfo(BaseModel):
     """
@@ -182,8 +347,8 @@ def _get_executor(model_type: Optional[str] = None) -> LLMExecutor:
     """
     Get the appropriate LLM executor based on the requested model type
     
-    This function implements a singleton-like pattern by caching the current executor
-    and only creating a new one when necessary. It also handles fallback logic when
+    This function reuses the executor of the current snapshot and only creates a new
+    one when a different model is requested. It also handles fallback logic when
     a requested model is not available.
     
     Args:
@@ -195,15 +360,18 @@ def _get_executor(model_type: Optional[str] = None) -> LLMExecutor:
     Raises:
         HTTPException: If the requested model is not available or cannot be initialized
     """
+    snapshot = APP_STATE.snapshot
+
     # If no model specified, use the current one
     if model_type is None:
-        model_type = APP_STATE.current_executor_type
+        model_type = snapshot.model_type
     
     # If requesting the current model and we have it cached, return it
-    if model_type == APP_STATE.current_executor_type and APP_STATE.current_executor is not None:
-        return APP_STATE.current_executor
+    if model_type == snapshot.model_type and snapshot.executor is not None:
+        return snapshot.executor
 
-    # Otherwise, try to create the requested executor
+    # Otherwise, try to create the requested executor with an up-to-date configuration
+    APP_STATE.factory_llm.refresh_if_stale()
     executor = APP_STATE.factory_llm.create_executor(model_type)
     
     if executor is None:
@@ -214,12 +382,32 @@ def _get_executor(model_type: Optional[str] = None) -> LLMExecutor:
             detail=f"Requested model '{model_type}' is not available. Available models: {available_str}"
         )
     
-    # Update the cache
-    APP_STATE.current_executor = executor
-    APP_STATE.current_executor_type = model_type
-    
     return executor
 
+def _activate_executor(model_type: Optional[str] = None) -> ExecutorSnapshot:
+    """
+    Make the requested LLM executor the active one
+    
+    The new snapshot is fully built before it is published, and it is swapped in
+    under the snapshot lock so concurrent requests never observe a half-switched state.
+    
+    Args:
+        model_type: The type of model to activate ('ollama', 'gemini', 'azure', or None for the current one)
+        
+    Returns:
+        The newly published ExecutorSnapshot
+        
+    Raises:
+        HTTPException: If the requested model is not available or cannot be initialized
+    """
+    with APP_STATE.snapshot_lock:
+        if model_type is None:
+            model_type = APP_STATE.snapshot.model_type
+        executor = _get_executor(model_type)
+        snapshot = ExecutorSnapshot(executor=executor, model_type=model_type, llm=executor.get_model())
+        APP_STATE.snapshot = snapshot
+    return snapshot
+
 def _get_embedding_model() -> EmbeddingModel:
     """
     Get the appropriate embedding model based on the requested model type
@@ -276,7 +464,7 @@ def _get_qdrant_client() -> QdrantClient:
             detail=f"Failed to initialize Qdrant client: {str(e)}"
         )
 
-def _get_retriever_instance(collection_name: str, top_k: int = 3) -> List[Dict[str, Any]]:
+def _get_retriever_instance(collection_name: str, top_k: int = 3, hnsw_ef: int = 64) -> List[Dict[str, Any]]:
     """
     Retrieve similar documents from Qdrant using the provided query.
 
@@ -284,6 +472,8 @@ def _get_retriever_instance(collection_name: str, top_k: int = 3) -> List[Dict[s
         query (str): The query string to search for similar documents.
         collection_name (str): The name of the Qdrant collection to search in.
         top_k (int, optional): The number of top similar documents to retrieve. Defaults to 3.
+        hnsw_ef (int, optional): The HNSW 'ef' search parameter. Smaller values visit fewer
+                                 graph neighbours per query and lower search latency. Defaults to 64.
 
     Returns:
         List[Dict[str, Any]]: A list of dictionaries representing the similar documents.
@@ -295,52 +485,171 @@ def _get_retriever_instance(collection_name: str, top_k: int = 3) -> List[Dict[s
         qdrant = QdrantVectorStore(
             client=_get_qdrant_client(),
             collection_name=collection_name,
-            embedding=_get_embedding_model().get_model()
+            embedding=_get_embedding_model()
         )
-        return qdrant.as_retriever(search_kwargs={'k': top_k})
+        return qdrant.as_retriever(search_kwargs={
+            'k': top_k,
+            'search_params': models.SearchParams(hnsw_ef=hnsw_ef, exact=False)
+        })
     except Exception as e:
         raise HTTPException(
             status_code=500,
             detail=f"Failed to convert to Retriever: {str(e)}"
         )
 
+def _extract_json_payload(reply: str) -> str:
+    """
+    Extract the JSON document from an LLM reply.
+    
+    Models usually wrap their JSON answer in a fenced code block; if a fence is found
+    its body is returned, otherwise the reply itself is assumed to be the JSON document.
+    
+    Args:
+        reply (str): The raw reply from the LLM.
+    
+    Returns:
+        str: The JSON text to be parsed.
+    """
+    match = _JSON_FENCE.search(reply)
+    return (match.group(1) if match else reply).strip()
+
+def _trim_documents(docs: List[Any], reserved_chars: int) -> List[Any]:
+    """
+    Trim retrieved documents so that they fit in the remaining prompt budget.
+    
+    The characters left after the reserved part of the prompt are split evenly across
+    the documents; each document keeps at least MIN_DOC_CHARS characters.
+    
+    Args:
+        docs (List[Document]): The documents returned by the retriever.
+        reserved_chars (int): Characters already used by the system prompt and the logs.
+    
+    Returns:
+        List[Document]: The same documents with their page_content truncated in place.
+    """
+    if not docs:
+        return docs
+    budget = max((LLM_CONTEXT_CHARS - reserved_chars) // len(docs), MIN_DOC_CHARS)
+    for doc in docs:
+        if len(doc.page_content) > budget:
+            doc.page_content = doc.page_content[:budget]
+    return docs
+
 def _write_to_mongodb(collection_name: str, data: Union[Dict[str, Any], List[Dict[str, Any]]]) -> bool:
     """
-    Write data to MongoDB using the MongoDBHandler.
+    Queue data to be written to MongoDB by the background writer.
+    
+    The documents are buffered and flushed in batches by _mongo_write_worker, so callers
+    do not pay a database round trip per document. Safe to call from worker threads.
     
     Args:
         collection_name (str): The name of the MongoDB collection to write to.
         data (Union[Dict[str, Any], List[Dict[str, Any]]]): The data to insert, either a single document (dict) 
                                                              or multiple documents (list of dicts).
     
+    Returns:
+        bool: True if the data was queued successfully, False otherwise.
+    """
+    try:
+        documents = data if isinstance(data, list) else [data]
+        for document in documents:
+            APP_STATE.event_loop.call_soon_threadsafe(
+                APP_STATE.mongo_write_queue.put_nowait, (collection_name, document)
+            )
+        return True
+    except Exception as e:
+        print(f"- ERROR - agent.py _write_to_mongodb() - Error queueing data for MongoDB: {str(e)}")
+        return False
+
+async def _bulk_write_to_mongodb(collection_name: str, documents: List[Dict[str, Any]]) -> bool:
+    """
+    Write a batch of documents to MongoDB using the AsyncMongoDBHandler.
+    
+    Args:
+        collection_name (str): The name of the MongoDB collection to write to.
+        documents (List[Dict[str, Any]]): The documents to insert.
+    
     Returns:
         bool: True if the write operation was successful, False otherwise.
     """
     try:
         # Ensure the collection exists
-        if not APP_STATE.mongo_handler.create_collection(collection_name):
-            print(f"- ERROR - agent.py _write_to_mongodb() - Failed to create or verify collection: {collection_name}")
+        if not await APP_STATE.async_mongo_handler.create_collection(collection_name):
+            print(f"- ERROR - agent.py _bulk_write_to_mongodb() - Failed to create or verify collection: {collection_name}")
             return False
         
-        # Insert the data
-        result = APP_STATE.mongo_handler.insert_data(collection_name, data)
+        # Insert the batch without stopping at the first failing document; queued writes are
+        # fire-and-forget, so a primary acknowledgement is enough
+        result = await APP_STATE.async_mongo_handler.insert_data(collection_name, documents, ordered=False, write_concern="fast")
         
         if result:
-            print(f"- INFO - agent.py _write_to_mongodb() - Successfully wrote data to MongoDB collection: {collection_name}")
+            print(f"- INFO - agent.py _bulk_write_to_mongodb() - Successfully wrote {len(documents)} documents to MongoDB collection: {collection_name}")
         else:
-            print(f"- ERROR - agent.py _write_to_mongodb() - Failed to write data to MongoDB collection: {collection_name}")
+            print(f"- ERROR - agent.py _bulk_write_to_mongodb() - Failed to write data to MongoDB collection: {collection_name}")
             
         return result
     except Exception as e:
-        print(f"- ERROR - agent.py _write_to_mongodb() - Error writing to MongoDB: {str(e)}")
+        print(f"- ERROR - agent.py _bulk_write_to_mongodb() - Error writing to MongoDB: {str(e)}")
         return False
 
-def _analyze_logs(
+async def _flush_mongo_batches(batches: Dict[str, List[Dict[str, Any]]]) -> None:
+    """
+    Write the buffered documents of each collection concurrently on the event loop.
+    
+    Args:
+        batches (Dict[str, List[Dict[str, Any]]]): Documents to write, grouped by collection name.
+    """
+    await asyncio.gather(*(
+        _bulk_write_to_mongodb(collection_name, documents)
+        for collection_name, documents in batches.items()
+    ))
+
+async def _mongo_write_worker() -> None:
+    """
+    Drain the MongoDB write queue in batches.
+    
+    Waits for the first queued document, then keeps collecting until either
+    MONGO_WRITE_BATCH_SIZE documents are buffered or MONGO_WRITE_FLUSH_INTERVAL
+    seconds have passed, and writes each collection's batch with one insert_many.
+    Returns after flushing its batch once it takes MONGO_WRITE_STOP from the queue.
+    """
+    queue = APP_STATE.mongo_write_queue
+    loop = asyncio.get_running_loop()
+    stopping = False
+    while not stopping:
+        item = await queue.get()
+        if item is MONGO_WRITE_STOP:
+            return
+        collection_name, document = item
+        batches: Dict[str, List[Dict[str, Any]]] = {collection_name: [document]}
+        count = 1
+        deadline = loop.time() + MONGO_WRITE_FLUSH_INTERVAL
+        while count < MONGO_WRITE_BATCH_SIZE:
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                item = await asyncio.wait_for(queue.get(), timeout)
+            except asyncio.TimeoutError:
+                break
+            if item is MONGO_WRITE_STOP:
+                stopping = True
+                break
+            collection_name, document = item
+            batches.setdefault(collection_name, []).append(document)
+            count += 1
+        try:
+            await _flush_mongo_batches(batches)
+        except Exception as e:
+            print(f"- ERROR - agent.py _mongo_write_worker() - Error flushing MongoDB batch: {str(e)}")
+
+async def _analyze_logs(
         logs: str,
         collection_name: Optional[str] = "SecurityCriteria",
         top_k: Optional[int] = 5,
         language_code: Optional[str] = 'zh',
-        log_src :str = 'From_Pure_Logs'
+        log_src :str = 'From_Pure_Logs',
+        hnsw_ef: Optional[int] = 64
         ) -> str:
     '''
     Analyze logs using the LLM executor and return the results.
@@ -351,18 +660,21 @@ def _analyze_logs(
         language_code (str): The language in which the report should be generated (default is 'zh' for Traditional Chinese and 'en' for English).
         log_src (str): The source of the logs, used for reporting purposes.
                        Default is 'From_Pure_Logs'.
+        hnsw_ef (int): The HNSW 'ef' search parameter used for the Qdrant similarity search.
     Returns:
         str: The analysis results from the LLM.
     '''
     try:
         print(f"- INFO - agent.py _analyze_logs() - Analyzing logs with language code: {language_code}")
+        # Use one consistent LLM for the whole analysis even if the model is switched meanwhile
+        llm = APP_STATE.snapshot.llm
         # Preview the logs before analysis
         preview_prompt = ChatPromptTemplate.from_messages([
             SystemMessage(APP_STATE.sysmsg_logpreviewer),
             ("human", "Preview the following logs:\n\n{input}")
         ])
-        preview_chain = preview_prompt | APP_STATE.llm
-        preview_result = preview_chain.invoke({"input": logs})
+        preview_chain = preview_prompt | llm
+        preview_result = await preview_chain.ainvoke({"input": logs})
         print(f"- INFO - agent.py _analyze_logs() - Log preview completed.")
 
         # Integrate with Qdrant for similarity search if a collection is specified
@@ -378,37 +690,33 @@ def _analyze_logs(
         
         # Create a document chain that can process the retrieved documents
         document_chain = create_stuff_documents_chain(
-            llm=APP_STATE.llm, # Use the base LLM, not the agent
+            llm=llm, # Use the base LLM, not the agent
             prompt=agent_prompt
         )
         
         # Get the retriever for security criteria
-        retriever = _get_retriever_instance(collection_name=collection_name, top_k=top_k)
+        retriever = _get_retriever_instance(collection_name=collection_name, top_k=top_k, hnsw_ef=hnsw_ef)
         
-        # Create a proper retrieval chain that will combine documents with the query
-        rag_chain = create_retrieval_chain(retriever, document_chain)
+        # Retrieve the security criteria once and feed them straight into the document chain
+        docs = await retriever.ainvoke(preview_result.content)
+        docs = _trim_documents(docs, len(APP_STATE.sysmsg_loganalyzer or '') + len(preview_result.content))
         
-        # The invoke method expects a dict with the 'input' key
-        agent_reply = rag_chain.invoke({"input": preview_result.content, "lang": language_code})
-        result = agent_reply.get('answer', 'No answer found').strip('`json')
+        # The document chain expects the retrieved documents under the 'context' key
+        agent_reply = await document_chain.ainvoke({"input": preview_result.content, "context": docs, "lang": language_code})
+        result = _extract_json_payload(agent_reply)
         print(f"- INFO - agent.py _analyze_logs() - Complete Log analysis")
         # print(f"Log analysis result: {result}\n")
-
-        # The result will be a dict with an "answer" key containing the processed response
         # print(f"Log preview result: {preview_result.content}\n")
-        # print(f"Agent reply type: {type(agent_reply)} keys:{agent_reply.keys()}\n")
-        # print(f"Agent reply input: {agent_reply.get('input', 'Non input found')}\n")
-        # print(f"Agent reply context: {agent_reply.get('context', 'No context found')}\n")
-        # print(f"Agent reply answer type: {type(agent_reply.get('answer', 'No answer found'))}\n") # str
-        # print(f"Agent reply answer: {agent_reply.get('answer', 'No answer found')}\n")
+        # print(f"Retrieved context: {docs}\n")
 
         # Write the analysis result to MongoDB
-        result_json = json.loads(result)
+        result_json = orjson.loads(result)
         # print(f"json parsing result: {result_json}")
 
         for dict_ele in result_json:
             if dict_ele:
-                _thread_safe_process(input=dict_ele, language_code=language_code, log_src=log_src)
+                # Minting the report ID may query MongoDB, so run it off the event loop
+                await asyncio.to_thread(_thread_safe_process, input=dict_ele, language_code=language_code, log_src=log_src)
         
         # Return just the answer string, not the whole dict
         return result
@@ -423,6 +731,35 @@ def _analyze_logs(
             detail=f"Failed to analyze logs: {str(e)}"
         )
 
+async def _analyze_logs_once(logs: str, **kwargs) -> str:
+    '''
+    Run _analyze_logs, sharing the result between identical concurrent requests.
+    
+    The first caller for a given log body and set of options starts the analysis; callers
+    arriving while it is still running await the same future instead of starting another
+    LLM and retriever run (and writing duplicate reports).
+    Args:
+        logs (str): The raw log data to analyze.
+        **kwargs: The remaining keyword arguments of _analyze_logs.
+    Returns:
+        str: The analysis results from the LLM.
+    '''
+    digest = hashlib.sha256(logs.encode('utf-8'))
+    digest.update(repr(sorted(kwargs.items())).encode('utf-8'))
+    key = digest.hexdigest()
+
+    async with APP_STATE.in_flight_lock:
+        future = APP_STATE.in_flight.get(key)
+        if future is None:
+            future = asyncio.ensure_future(_analyze_logs(logs, **kwargs))
+            APP_STATE.in_flight[key] = future
+            future.add_done_callback(lambda _: APP_STATE.in_flight.pop(key, None))
+        else:
+            print(f"- INFO - agent.py _analyze_logs_once() - Identical analysis already running, waiting for its result")
+
+    # Shield the shared analysis so a disconnecting client does not cancel it for the other waiters
+    return await asyncio.shield(future)
+
 def _thread_safe_process(input:dict=None, language_code:str='' , log_src:str = '') -> bool:
     '''
     Thread-safe function to process input data and launch QRT execution.
@@ -435,22 +772,20 @@ def _thread_safe_process(input:dict=None, language_code:str='' , log_src:str = '
     '''
     try:
         if input:
-            import threading
-            with threading.Lock():
-                timestamp_float = datetime.datetime.now().timestamp()
-                input['timestamp'] = timestamp_float
-                report_id = APP_STATE.report_id_factory.generate_report_id()
-                input['report_id'] = report_id
-                input['log_src'] = log_src
-
-                # Start the QRT thread to handle quick response team execution
-                print(f"- INFO - agent.py _thread_safe_process() - Starting to launch QRT...")
-                qrt = threading.Thread(target=_launch_qrt, args=(str(input), language_code, timestamp_float, report_id, log_src, input.get("analysis_report", '')))
-                qrt.start()  # Start the QRT thread to handle quick response team execution
-
-                print(f"- INFO - agent.py _thread_safe_process() - Starting to write log analysis result to MongoDB...")
-                mongo = threading.Thread(target=_write_to_mongodb, args=('LogAnalysisResults', input))
-                mongo.start()
+            # generate_report_id serializes concurrent callers itself, so no lock is needed here
+            timestamp_float = time.time()
+            input['timestamp'] = timestamp_float
+            report_id = APP_STATE.report_id_factory.generate_report_id()
+            input['report_id'] = report_id
+            input['log_src'] = log_src
+
+            # Start the QRT thread to handle quick response team execution
+            print(f"- INFO - agent.py _thread_safe_process() - Starting to launch QRT...")
+            qrt = threading.Thread(target=_launch_qrt, args=(str(input), language_code, timestamp_float, report_id, log_src, input.get("analysis_report", '')))
+            qrt.start()  # Start the QRT thread to handle quick response team execution
+
+            print(f"- INFO - agent.py _thread_safe_process() - Queueing log analysis result for MongoDB...")
+            _write_to_mongodb('LogAnalysisResults', input)
 
         return True
     except Exception as e:
@@ -491,7 +826,7 @@ def _launch_qrt(
         ])
         
         # Create a document chain that can process the retrieved documents
-        document_chain = create_stuff_documents_chain(llm = APP_STATE.llm, prompt = qrt_prompt)
+        document_chain = create_stuff_documents_chain(llm = APP_STATE.snapshot.llm, prompt = qrt_prompt)
         
         # Get the retriever for security criteria
         retriever_sop = _get_retriever_instance(collection_name='SOP', top_k=5)
@@ -512,7 +847,7 @@ def _launch_qrt(
         
         # The invoke method expects a dict with the 'input' key
         agent_reply = rag_chain.invoke({"input": condition, "lang": language_code})
-        result = agent_reply.get('answer', 'No answer found').strip('`json') # string
+        result = _extract_json_payload(agent_reply.get('answer', 'No answer found')) # string
         # print(f"Complete QRT execution")
         # print(f"QRT response: {result}\n")
 
@@ -523,7 +858,7 @@ def _launch_qrt(
         # print(f"Agent reply answer: {agent_reply.get('answer', 'No answer found')}\n")
 
         # Write the QRT response to MongoDB
-        result_json = json.loads(result)
+        result_json = orjson.loads(result)
         result_json['short_report'] += f"\n*Report ID:* {report_id}\n" if language_code == 'en' else f"\n*報告 ID:* {report_id}\n"
         result_json['short_report'] += f"\n*Log Source:* {log_src}\n" if language_code == 'en' else f"\n*日誌來源:* {log_src}\n"
         result_json['md_content'] = md_content
@@ -531,9 +866,7 @@ def _launch_qrt(
         # Send the QRT response to the RPA endpoint
         print(f"- INFO - agent.py _launch_qrt() - Sending QRT response to RPA endpoint...")
         if result_json.get('priority_level') == 'P1' or result_json.get('priority_level') == 'P2':
-            import requests
-            from utils.endpoint import endpoint_rpa_url
-            requests.post(endpoint_rpa_url, json=result_json)
+            APP_STATE.rpa_session.post(endpoint_rpa_url, json=result_json, timeout=RPA_REQUEST_TIMEOUT)
             
         # Add timestamp to the result JSON and write to MongoDB
         result_json['timestamp'] = timestamp
@@ -566,12 +899,12 @@ async def health_check():
         dict: A dictionary with the health status and relevant information
     """
     try:
-        available_models = APP_STATE.factory_llm.get_available_executors()
+        available_models = await APP_STATE.factory_llm.get_available_executors_async()
 
         return {
             "status": "healthy",
             "available_models": available_models,
-            "current_model": APP_STATE.current_executor_type
+            "current_model": APP_STATE.snapshot.model_type
         }
     except Exception as e:
         return {
@@ -593,14 +926,15 @@ async def list_models():
     """
     try:
         # available = LLM_FACTORY.get_available_executors()
-        available = APP_STATE.factory_llm.get_available_executors()
+        available = await APP_STATE.factory_llm.get_available_executors_async()
+        current_model_type = APP_STATE.snapshot.model_type
         
         models_info = []
         for model in available:
             models_info.append(ModelInfo(
                 name=model,
                 description=f"LLM executor for {model.capitalize()}",
-                is_current=(model == APP_STATE.current_executor_type)
+                is_current=(model == current_model_type)
             ))
         
         return APIResponse(
@@ -639,10 +973,15 @@ async def switch_model(model_type: str = Body(..., embed=True)):
                 detail=f"Invalid model type '{model_type}'. Supported models: 'ollama', 'gemini', 'azure'."
             )
 
-        # Try to get the executor for the requested model
-        APP_STATE.current_executor = _get_executor(model_type)
-        APP_STATE.current_executor_type = model_type
-        APP_STATE.llm = APP_STATE.current_executor.get_model()  # Update the LLM
+        # A switch would only reach the worker process serving this request
+        if WEB_CONCURRENCY > 1:
+            raise HTTPException(
+                status_code=409,
+                detail=f"Switching models is not supported with {WEB_CONCURRENCY} workers; run a single worker or configure the model instead."
+            )
+
+        # Try to get the executor for the requested model and publish it with its LLM
+        _activate_executor(model_type)
         
         return APIResponse(
             success=True,
@@ -688,7 +1027,7 @@ async def analyze_logs(request: LogAnalysisRequest, language_code: Optional[str]
         return {
             "success": True,
             "message": "Log analysis started",
-            "data": _analyze_logs(request.logs,language_code=language_code,)
+            "data": await _analyze_logs_once(request.logs, language_code=language_code, hnsw_ef=request.hnsw_ef)
         }
 
     except HTTPException as e:
@@ -698,6 +1037,143 @@ async def analyze_logs(request: LogAnalysisRequest, language_code: Optional[str]
             data=None
         )
 
+def _load_cached_analysis(key: str) -> Optional[str]:
+    """
+    Look up a stored analysis result in the analysis cache; blocking, run it on a worker thread
+    
+    Args:
+        key: The cache key of the log content and report language
+    
+    Returns:
+        The stored analysis result, or None if there is none
+    """
+    with APP_STATE.analysis_cache_lock:
+        row = APP_STATE.analysis_cache.execute("SELECT result FROM results WHERE hash = ?", (key,)).fetchone()
+    return row[0] if row is not None else None
+
+def _store_cached_analysis(key: str, result: str) -> None:
+    """
+    Store an analysis result in the analysis cache; blocking (the commit syncs to disk), run it on a worker thread
+    
+    Args:
+        key: The cache key of the log content and report language
+        result: The analysis result to store
+    """
+    with APP_STATE.analysis_cache_lock:
+        APP_STATE.analysis_cache.execute("INSERT OR REPLACE INTO results (hash, result) VALUES (?, ?)", (key, result))
+        APP_STATE.analysis_cache.commit()
+
+async def _analyze_uploaded_log(content: str, language_code: str, log_src: str) -> str:
+    """
+    Analyze the content of an uploaded log file, reusing the stored result of an identical upload
+    
+    When the analysis cache is enabled, results are stored by the sha256 of the content and
+    the report language, so re-uploading an unchanged file skips the LLM analysis (and does
+    not create duplicate reports or alerts).
+    
+    Args:
+        content: The decoded content of the log file
+        language_code: The language in which the report should be generated
+        log_src: The source of the logs, used for reporting purposes
+    
+    Returns:
+        str: The analysis results from the LLM
+    """
+    if APP_STATE.analysis_cache is None:
+        return await _analyze_logs_once(content, language_code=language_code, log_src=log_src)
+    
+    key = hashlib.sha256(f"{language_code}\0{content}".encode('utf-8')).hexdigest()
+    cached = await asyncio.to_thread(_load_cached_analysis, key)
+    if cached is not None:
+        print(f"- INFO - agent.py _analyze_uploaded_log() - Reusing the analysis of an identical upload for: {log_src}")
+        return cached
+    
+    result = await _analyze_logs_once(content, language_code=language_code, log_src=log_src)
+    await asyncio.to_thread(_store_cached_analysis, key, result)
+    return result
+
+def _is_log_upload_accepted(file: UploadFile) -> bool:
+    """
+    Check whether an uploaded log file should be analyzed
+    
+    Args:
+        file: The uploaded log file
+    
+    Returns:
+        bool: False for test files, which are skipped, True otherwise
+    
+    Raises:
+        HTTPException: If the file extension is not supported
+    """
+    file_name = Path(file.filename)
+    # For zstd-compressed uploads check the extension of the compressed file
+    if file_name.suffix.lower() == ZSTD_EXTENSION:
+        file_name = file_name.with_suffix('')
+    file_extension = file_name.suffix.lower()
+
+    if file_extension not in ALLOWED_LOG_EXTENSIONS:
+        raise HTTPException(
+            status_code=400, 
+            detail=f"Unsupported file extension: {file_extension}. Allowed: {', '.join(ALLOWED_LOG_EXTENSIONS)}"
+        )
+    
+    return not file.filename.lower().count('test')
+
+async def _save_log_upload(file: UploadFile) -> str:
+    """
+    Save an uploaded log file to the logs directory and return its content
+    
+    Args:
+        file: The uploaded log file
+    
+    Returns:
+        str: The decoded content of the file
+    """
+    # Create docs directory if it doesn't exist
+    docs_dir = Path("logs")
+    docs_dir.mkdir(exist_ok=True)
+    
+    # Save file to docs directory
+    file_path = docs_dir / file.filename
+    print(f"- INFO - agent.py _save_log_upload() - Saving file to: {file_path}")
+    
+    # Read the upload once; the same bytes are saved to disk and decoded for analysis
+    raw = await file.read()
+
+    # Write the bytes on a worker thread to avoid blocking the event loop
+    await asyncio.to_thread(file_path.write_bytes, raw)
+    
+    if file_path.suffix.lower() == ZSTD_EXTENSION or file.content_type == 'application/zstd':
+        raw = await asyncio.to_thread(_decompress_zstd, raw)
+    
+    return raw.decode('utf-8')
+
+def _decompress_zstd(data: bytes) -> bytes:
+    """
+    Decompress a zstd-compressed upload
+    
+    The frame may not record its decompressed size, so the data is streamed and the
+    output is capped at MAX_DECOMPRESSED_LOG_BYTES.
+    
+    Args:
+        data: The compressed bytes
+    
+    Returns:
+        bytes: The decompressed bytes
+    
+    Raises:
+        ValueError: If the decompressed data exceeds MAX_DECOMPRESSED_LOG_BYTES
+    """
+    chunks = []
+    total = 0
+    with zstandard.ZstdDecompressor().stream_reader(data) as reader:
+        while chunk := reader.read(1 << 20):
+            total += len(chunk)
+            if total > MAX_DECOMPRESSED_LOG_BYTES:
+                raise ValueError(f"Decompressed log exceeds {MAX_DECOMPRESSED_LOG_BYTES} bytes")
+            chunks.append(chunk)
+    return b''.join(chunks)
+
 @app.post("/agent/analyze-logs/upload", response_model=APIResponse)
 async def analyze_logs_upload(file: UploadFile = File(...), language_code: Optional[str] = 'zh'):
     """
@@ -705,7 +1181,7 @@ async def analyze_logs_upload(file: UploadFile = File(...), language_code: Optio
     This endpoint allows clients to upload log files for analysis. It checks the file
     extension, saves the file to a designated directory, and then reads the contents
     for analysis using the LLM. It supports common log file formats like .txt, .csv,
-    .json, and .log.
+    .json, and .log, also zstd-compressed with an added .zst extension.
 
     Args:
         file: The log file to be uploaded and analyzed. Must be one of the allowed formats.
@@ -720,17 +1196,7 @@ async def analyze_logs_upload(file: UploadFile = File(...), language_code: Optio
             detail="Invalid report language specified. Supported languages are 'zh' (Traditional Chinese) and 'en' (English)."
         )
     
-    # Check file extension
-    allowed_extensions = ['.txt', '.csv', '.json', '.log', 'md']
-    file_extension = Path(file.filename).suffix.lower()
-
-    if file_extension not in allowed_extensions:
-        raise HTTPException(
-            status_code=400, 
-            detail=f"Unsupported file extension: {file_extension}. Allowed: {', '.join(allowed_extensions)}"
-        )
-    
-    if file.filename.lower().count('test'):
+    if not _is_log_upload_accepted(file):
         print(f"- INFO - agent.py analyze_logs_upload() - Test file detected, skipping analysis.")
         return {
             "success": True,
@@ -739,39 +1205,74 @@ async def analyze_logs_upload(file: UploadFile = File(...), language_code: Optio
         }
     
     try:
-        # Create docs directory if it doesn't exist
-        docs_dir = Path("logs")
-        docs_dir.mkdir(exist_ok=True)
-        
-        # Save file to docs directory
-        file_path = docs_dir / file.filename
-        print(f"- INFO - agent.py analyze_logs_upload() - Saving file to: {file_path}")
-        
-        # Read directly from UploadFile (before saving)
-        # As file.read() happens, the internal file cursor advances to the very end of the file
-        content = await file.read()
-        content = content.decode('utf-8')
-        # Rewind the file cursor to the beginning
-        await file.seek(0)
-
-        # The crucial step: write the contents of the UploadFile to the new file
-        # Using a sync operation with a thread pool to avoid blocking the event loop
-        # Save file by tempfile
-        import shutil
-        with open(file_path, "wb") as buffer:
-            shutil.copyfileobj(file.file, buffer)
+        content = await _save_log_upload(file)
         
         return {
             "success": True,
             "message": "Log analysis started",
-            "data": _analyze_logs(content, language_code=language_code, log_src=file.filename)
+            "data": await _analyze_uploaded_log(content, language_code=language_code, log_src=file.filename)
         }
     except Exception as e:
         # Catch and handle exceptions, making sure to include the original error message
         # for better debugging.
         raise HTTPException(status_code=500, detail=f"Error processing document: {str(e)}")
-    finally:
-        del content
+
+@app.post("/agent/analyze-logs/upload-batch", response_model=APIResponse)
+async def analyze_logs_upload_batch(files: List[UploadFile] = File(...), language_code: Optional[str] = 'zh'):
+    """
+    Analyze several uploaded log files with a single request
+    This endpoint accepts the log files as repeated 'files' form fields, so clients can
+    send a whole batch in one multipart request instead of one request per file. Every
+    file is validated and saved like in /agent/analyze-logs/upload, then the files are
+    analyzed concurrently.
+
+    Args:
+        files: The log files to be uploaded and analyzed (at most MAX_UPLOAD_BATCH_FILES).
+    
+    Returns:
+        APIResponse: A standardized response with one result entry per uploaded file
+    """
+    # Validate the language code
+    if language_code not in ['zh', 'en']:
+        raise HTTPException(
+            status_code=400,
+            detail="Invalid report language specified. Supported languages are 'zh' (Traditional Chinese) and 'en' (English)."
+        )
+    
+    if len(files) > MAX_UPLOAD_BATCH_FILES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Too many files in one batch: {len(files)}. Maximum: {MAX_UPLOAD_BATCH_FILES}"
+        )
+    
+    # Validate every file before starting any analysis
+    accepted = [file for file in files if _is_log_upload_accepted(file)]
+    print(f"- INFO - agent.py analyze_logs_upload_batch() - Received {len(files)} files, {len(accepted)} to analyze")
+    
+    try:
+        contents = [await _save_log_upload(file) for file in accepted]
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error processing document: {str(e)}")
+    
+    replies = await asyncio.gather(
+        *(_analyze_uploaded_log(content, language_code=language_code, log_src=file.filename)
+          for file, content in zip(accepted, contents)),
+        return_exceptions=True
+    )
+    
+    results = []
+    for file, reply in zip(accepted, replies):
+        if isinstance(reply, Exception):
+            error = reply.detail if isinstance(reply, HTTPException) else str(reply)
+            results.append({"filename": file.filename, "success": False, "error": error})
+        else:
+            results.append({"filename": file.filename, "success": True, "result": reply})
+    
+    return {
+        "success": all(result["success"] for result in results),
+        "message": f"Log analysis completed for {len(results)} files",
+        "data": results
+    }
 
 @app.get("/agent/docs", response_model=APIResponse)
 async def get_api_docs():
@@ -814,7 +1315,8 @@ async def get_api_docs():
                 "body": {
                     "logs": "string",
                     "collection_name": "string (optional)",
-                    "top_k": "integer (optional)"
+                    "top_k": "integer (optional)",
+                    "hnsw_ef": "integer (optional, default: 64)"
                 },
                 "query_params": {
                     "language_code": "string (optional, 'zh' or 'en', default: 'zh')"
@@ -823,11 +1325,20 @@ async def get_api_docs():
             {
                 "path": "/agent/analyze-logs/upload",
                 "method": "POST",
-                "description": "Upload a log file for analysis.",
+                "description": "Upload a log file for analysis. Files may be zstd-compressed with a '.zst' extension.",
                 "body": "file (multipart/form-data)",
                 "query_params": {
                     "language_code": "string (optional, 'zh' or 'en', default: 'zh')"
                 }
+            },
+            {
+                "path": "/agent/analyze-logs/upload-batch",
+                "method": "POST",
+                "description": "Upload several log files for analysis in one request.",
+                "body": "files (multipart/form-data, repeated, up to 20 files)",
+                "query_params": {
+                    "language_code": "string (optional, 'zh' or 'en', default: 'zh')"
+                }
             }
         ]
     }
@@ -838,4 +1349,14 @@ async def get_api_docs():
     )
 
 if __name__ == "__main__":
-    uvicorn.run("agent:app", host="0.0.0.0", port=10001)
+    # uvloop is not available on Windows, fall back to the default asyncio loop there
+    uvicorn.run(
+        "agent:app",
+        host="0.0.0.0",
+        port=10001,
+        workers=WEB_CONCURRENCY,
+        loop="asyncio" if os.name == "nt" else "uvloop",
+        http="httptools",
+        limit_concurrency=100,
+        timeout_keep_alive=30
+    )
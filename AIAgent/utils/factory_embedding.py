@@ -1,121 +1,250 @@
+import hashlib
+import importlib
+import os
+import sys
+import numpy as np
 import requests
+import threading
 from abc import ABC, abstractmethod
+from concurrent.futures import Future, ThreadPoolExecutor
+from collections import OrderedDict
+from dataclasses import dataclass
+from itertools import chain
 from typing import Dict, Any, Optional, List
+from langchain_core.embeddings import Embeddings
 from .endpoint import endpoint_url
 
 # HTTP Endpoint
 CONFIG_EMBED_URL = endpoint_url + "config_embed"
 
+# Set EMBED_CONFIG_PREFETCH=1 to start fetching the configuration in the background at import time
+_config_future: Optional[Future] = None
+if os.environ.get("EMBED_CONFIG_PREFETCH") == "1":
+    _prefetch_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="embed-config")
+    _config_future = _prefetch_executor.submit(requests.get, CONFIG_EMBED_URL, timeout=5)
+    _prefetch_executor.shutdown(wait=False)
+
+def _fetch_config_response() -> requests.Response:
+    """Return the configuration response, waiting for the prefetch if one was started"""
+    if _config_future is not None:
+        return _config_future.result(timeout=5)
+    return requests.get(CONFIG_EMBED_URL, timeout=5)
+
+# Remote providers: documents per embedding request and number of requests in flight
+EMBED_BATCH = 64
+EMBED_CONCURRENCY = 8
+
+def _embed_in_batches(embeddings, documents: List[str]) -> List[List[float]]:
+    """
+    Embed documents in fixed-size batches sent concurrently, keeping the input order
+    
+    Args:
+        embeddings: The LangChain embeddings object
+        documents: The documents to embed
+    
+    Returns:
+        The embeddings of the documents, in the same order
+    """
+    if len(documents) <= EMBED_BATCH:
+        return embeddings.embed_documents(documents)
+    batches = [documents[i:i + EMBED_BATCH] for i in range(0, len(documents), EMBED_BATCH)]
+    with ThreadPoolExecutor(max_workers=min(EMBED_CONCURRENCY, len(batches))) as executor:
+        results = executor.map(embeddings.embed_documents, batches)
+        return list(chain.from_iterable(results))
+
+# Number of embedding vectors kept in memory by the embedding cache
+EMBED_CACHE_SIZE = 4096
+
+class _EmbeddingCache:
+    """
+    Thread-safe in-memory LRU of embedding vectors keyed by model and text hash
+    
+    Vectors are stored as float16 numpy arrays, a quarter of the size of a list of Python
+    floats, and handed back as lists of floats. put() returns the stored vector as well,
+    so a text gets the same float16-rounded vector on a cache miss as on a hit.
+    """
+    
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._data: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+    
+    @staticmethod
+    def key(namespace: str, text: str) -> tuple:
+        return (namespace, hashlib.sha256(text.encode('utf-8')).digest())
+    
+    def get(self, key: tuple) -> Optional[List[float]]:
+        with self._lock:
+            vector = self._data.get(key)
+            if vector is None:
+                return None
+            self._data.move_to_end(key)
+        return vector.astype(np.float32).tolist()
+    
+    def put(self, key: tuple, vector: List[float]) -> List[float]:
+        stored = np.asarray(vector, dtype=np.float16)
+        with self._lock:
+            self._data[key] = stored
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+        return stored.astype(np.float32).tolist()
+
+_EMBED_CACHE = _EmbeddingCache(EMBED_CACHE_SIZE)
+
+def _cached_embed(namespace: str, texts: List[str], embed_fn) -> List[List[float]]:
+    """
+    Embed texts, only sending the ones not found in the embedding cache to the provider
+    
+    Args:
+        namespace: Identifies the provider, model and kind of embedding (query or document)
+        texts: The texts to embed
+        embed_fn: Function embedding a list of texts with the provider
+    
+    Returns:
+        The embeddings of the texts, in the same order
+    """
+    keys = [_EMBED_CACHE.key(namespace, text) for text in texts]
+    vectors = [_EMBED_CACHE.get(key) for key in keys]
+    misses = [i for i, vector in enumerate(vectors) if vector is None]
+    if misses:
+        new_vectors = embed_fn([texts[i] for i in misses])
+        for i, vector in zip(misses, new_vectors):
+            vectors[i] = _EMBED_CACHE.put(keys[i], vector)
+    return vectors
+
 class EmbeddingModel(ABC):
     """Abstract base class for embedding models"""
+
     @abstractmethod
     def get_model(self, **kwargs):
         """Get the underlying embedding model object"""
         pass
 
-class OllamaEmbedding(EmbeddingModel):
-    """Embedding model for Ollama using LangChain"""
-    
-    def __init__(self, config: Dict[str, Any]):
-        self.base_url = config.get('base_url', 'http://localhost:11434')
-        self.model = config.get('embedding_model', 'nomic-embed-text')
-        self.current_model = self.model
-        self._embeddings = None
+    @abstractmethod
+    def is_available(self) -> bool:
+        """Check if the embedding model is available for use"""
+        pass
+
+@dataclass(frozen=True)
+class ProviderSpec:
+    """
+    Describes how to build the LangChain embeddings object of one provider
     
-    def _initialize_embeddings(self):
-        try:
-            from langchain_ollama import OllamaEmbeddings
-            
-            self._embeddings = OllamaEmbeddings(
-                base_url=self.base_url,
-                model=self.current_model
-            )
-        except Exception as e:
-            print(f"- ERROR - factory_embedding.py OllamaEmbedding._initialize_embeddings() - Error initializing Ollama embeddings: {str(e)}")
-            self._embeddings = None
+    Attributes:
+        name: Provider type used by the factory ('ollama', 'gemini', 'azure')
+        display_name: Provider name used in log messages
+        import_path: Dotted path of the LangChain embeddings class
+        kwargs_map: Constructor argument -> (config key, default value)
+        model_kwarg: Constructor argument holding the model, which get_model() can switch
+        switch_kwarg: Keyword argument of get_model() selecting another model
+        required: Constructor arguments that must be set for the provider to be available;
+                  if empty, the provider is available when the embeddings object can be built
+        batched: Whether embed_documents sends the documents in concurrent batches
+        cache_kwargs: Constructor arguments identifying the embeddings in the embedding cache
+    """
+    name: str
+    display_name: str
+    import_path: str
+    kwargs_map: Dict[str, tuple]
+    model_kwarg: str
+    switch_kwarg: str
+    required: tuple = ()
+    batched: bool = False
+    cache_kwargs: tuple = ()
+
+EMBEDDING_PROVIDERS: Dict[str, ProviderSpec] = {
+    'ollama': ProviderSpec(
+        name='ollama',
+        display_name='Ollama',
+        import_path='langchain_ollama.OllamaEmbeddings',
+        kwargs_map={
+            'base_url': ('base_url', 'http://localhost:11434'),
+            'model': ('embedding_model', 'nomic-embed-text')
+        },
+        model_kwarg='model',
+        switch_kwarg='model',
+        cache_kwargs=('model',)
+    ),
+    'azure': ProviderSpec(
+        name='azure',
+        display_name='Azure OpenAI',
+        import_path='langchain_openai.AzureOpenAIEmbeddings',
+        kwargs_map={
+            'azure_deployment': ('embedding_deployment', ''),
+            'openai_api_version': ('api_version', ''),
+            'azure_endpoint': ('api_base', ''),
+            'api_key': ('api_key', '')
+        },
+        model_kwarg='azure_deployment',
+        switch_kwarg='deployment',
+        required=('api_key', 'azure_endpoint', 'azure_deployment'),
+        batched=True,
+        cache_kwargs=('azure_deployment',)
+    ),
+    'gemini': ProviderSpec(
+        name='gemini',
+        display_name='Gemini',
+        import_path='langchain_google_genai.GoogleGenerativeAIEmbeddings',
+        kwargs_map={
+            'model': ('model_name', 'models/embedding-001'),
+            'google_api_key': ('api_key', ''),
+            'output_dimensionality': ('output_dimensionality', 768)
+        },
+        model_kwarg='model',
+        switch_kwarg='model',
+        required=('google_api_key',),
+        batched=True,
+        cache_kwargs=('model', 'output_dimensionality')
+    )
+}
+
+class LangchainEmbedding(EmbeddingModel, Embeddings):
+    """
+    Embedding model for any LangChain embeddings class described by a ProviderSpec
     
-    def get_model(self, **kwargs):
-        """Get the underlying OllamaEmbeddings model object"""
-        if kwargs.get('model') and kwargs.get('model') != self.current_model:
-            self.current_model = kwargs.get('model')
-            self._initialize_embeddings()
-        
-        if not self._embeddings:
-            self._initialize_embeddings()
-            
-        return self._embeddings
-        
-    def embed_query(self, text: str) -> List[float]:
-        """Generate embeddings for a single text query"""
-        try:
-            embeddings = self.get_model()
-            
-            if not embeddings:
-                print(f"- ERROR - factory_embedding.py OllamaEmbedding.embed_query() - Failed to initialize Ollama embeddings")
-                return []
-                
-            return embeddings.embed_query(text)
-        except Exception as e:
-            print(f"- ERROR - factory_embedding.py OllamaEmbedding.embed_query() - Error generating embeddings from Ollama: {str(e)}")
-            return []
+    It is itself a LangChain Embeddings, so vector stores given this object embed through
+    the embedding cache and the batching of embed_documents.
+    """
     
-    def embed_documents(self, documents: List[str]) -> List[List[float]]:
-        """Generate embeddings for a list of documents"""
-        try:
-            embeddings = self.get_model()
-            
-            if not embeddings:
-                print(f"- ERROR - factory_embedding.py OllamaEmbedding.embed_documents() - Failed to initialize Ollama embeddings")
-                return []
-                
-            return embeddings.embed_documents(documents)
-        except Exception as e:
-            print(f"- ERROR - factory_embedding.py OllamaEmbedding.embed_documents() - Error generating document embeddings from Ollama: {str(e)}")
-            return []
-            
-    def is_available(self) -> bool:
-        """Check if the embedding model is available"""
-        try:
-            model = self.get_model()
-            return model is not None
-        except:
-            return False
-
-class AzureOpenAIEmbedding(EmbeddingModel):
-    """Embedding model for Azure OpenAI using LangChain"""
-    
-    def __init__(self, config: Dict[str, Any]):
-        self.api_key = config.get('api_key', '')
-        self.api_base = config.get('api_base', '')
-        self.api_version = config.get('api_version', '')
-        self.deployment = config.get('embedding_deployment', '')
-        self.current_deployment = self.deployment
+    def __init__(self, spec: ProviderSpec, config: Dict[str, Any]):
+        self.spec = spec
+        self._kwargs = {}
+        for kwarg, (key, default) in spec.kwargs_map.items():
+            value = config.get(key, default)
+            # Convert string to int if necessary
+            if isinstance(default, int) and isinstance(value, str):
+                value = int(value)
+            self._kwargs[kwarg] = value
+        self.current_model = self._kwargs[spec.model_kwarg]
         self._embeddings = None
+        # Key of the settings the current embeddings object was built with
+        self._init_key = None
     
     def _initialize_embeddings(self):
         try:
-            from langchain_openai import AzureOpenAIEmbeddings
-            
-            self._embeddings = AzureOpenAIEmbeddings(
-                azure_deployment=self.current_deployment,
-                openai_api_version=self.api_version,
-                azure_endpoint=self.api_base,
-                api_key=self.api_key
-            )
+            # Resolved through the module __getattr__ on first use, a plain global lookup afterwards
+            ctor = getattr(sys.modules[__name__], self.spec.import_path.rsplit('.', 1)[1])
+            self._embeddings = ctor(**{**self._kwargs, self.spec.model_kwarg: self.current_model})
         except Exception as e:
-            print(f"- ERROR - factory_embedding.py AzureOpenAIEmbedding._initialize_embeddings() - Error initializing Azure OpenAI embeddings: {str(e)}")
+            print(f"- ERROR - factory_embedding.py LangchainEmbedding._initialize_embeddings() - Error initializing {self.spec.display_name} embeddings: {str(e)}")
             self._embeddings = None
     
     def get_model(self, **kwargs):
-        """Get the underlying AzureOpenAIEmbeddings model object"""
-        if kwargs.get('deployment') and kwargs.get('deployment') != self.current_deployment:
-            self.current_deployment = kwargs.get('deployment')
-            self._initialize_embeddings()
-        
-        if not self._embeddings:
+        """Get the underlying LangChain embeddings object"""
+        # Rebuild only when the requested settings differ from the ones last built successfully
+        key = (kwargs.get(self.spec.switch_kwarg) or self.current_model,)
+        if key != self._init_key:
+            self.current_model = key[0]
             self._initialize_embeddings()
+            self._init_key = key if self._embeddings is not None else None
             
         return self._embeddings
+    
+    def _cache_namespace(self, kind: str) -> str:
+        """Identify the provider, model and kind of embedding ('query' or 'document') in the embedding cache"""
+        values = [self.current_model if kwarg == self.spec.model_kwarg else self._kwargs[kwarg] for kwarg in self.spec.cache_kwargs]
+        return ':'.join([self.spec.name, *map(str, values), kind])
         
     def embed_query(self, text: str) -> List[float]:
         """Generate embeddings for a single text query"""
@@ -123,12 +252,12 @@ class AzureOpenAIEmbedding(EmbeddingModel):
             embeddings = self.get_model()
             
             if not embeddings:
-                print(f"- ERROR - factory_embedding.py AzureOpenAIEmbedding.embed_query() - Failed to initialize Azure OpenAI embeddings")
+                print(f"- ERROR - factory_embedding.py LangchainEmbedding.embed_query() - Failed to initialize {self.spec.display_name} embeddings")
                 return []
                 
-            return embeddings.embed_query(text)
+            return _cached_embed(self._cache_namespace('query'), [text], lambda texts: [embeddings.embed_query(texts[0])])[0]
         except Exception as e:
-            print(f"- ERROR - factory_embedding.py AzureOpenAIEmbedding.embed_query() - Error generating embeddings from Azure OpenAI: {str(e)}")
+            print(f"- ERROR - factory_embedding.py LangchainEmbedding.embed_query() - Error generating embeddings from {self.spec.display_name}: {str(e)}")
             return []
     
     def embed_documents(self, documents: List[str]) -> List[List[float]]:
@@ -137,110 +266,77 @@ class AzureOpenAIEmbedding(EmbeddingModel):
             embeddings = self.get_model()
             
             if not embeddings:
-                print(f"- ERROR - factory_embedding.py AzureOpenAIEmbedding.embed_documents() - Failed to initialize Azure OpenAI embeddings")
+                print(f"- ERROR - factory_embedding.py LangchainEmbedding.embed_documents() - Failed to initialize {self.spec.display_name} embeddings")
                 return []
-                
-            return embeddings.embed_documents(documents)
+            
+            if self.spec.batched:
+                embed_fn = lambda texts: _embed_in_batches(embeddings, texts)
+            else:
+                embed_fn = embeddings.embed_documents
+            return _cached_embed(self._cache_namespace('document'), documents, embed_fn)
         except Exception as e:
-            print(f"- ERROR - factory_embedding.py AzureOpenAIEmbedding.embed_documents() - Error generating document embeddings from Azure OpenAI: {str(e)}")
+            print(f"- ERROR - factory_embedding.py LangchainEmbedding.embed_documents() - Error generating document embeddings from {self.spec.display_name}: {str(e)}")
             return []
             
     def is_available(self) -> bool:
         """Check if the embedding model is available"""
-        return bool(self.api_key and self.api_base and self.deployment)
- 
-class GeminiEmbedding(EmbeddingModel):
-    """Embedding model for Google's Gemini API using LangChain"""
-    
-    def __init__(self, config: Dict[str, Any]):
-        self.api_key = config.get('api_key', '')
-        self.model_name = config.get('model_name', 'models/embedding-001')
-        # Convert string to int if necessary
-        output_dim = config.get('output_dimensionality', 768)
-        self.output_dimensionality = int(output_dim) if isinstance(output_dim, str) else output_dim
-        self.current_model = self.model_name
-        self._embeddings = None
-    
-    def _initialize_embeddings(self):
-        try:
-            from langchain_google_genai import GoogleGenerativeAIEmbeddings
-            
-            self._embeddings = GoogleGenerativeAIEmbeddings(
-                model=self.current_model,
-                google_api_key=self.api_key,
-                output_dimensionality=self.output_dimensionality
-            )
-        except Exception as e:
-            print(f"- ERROR - factory_embedding.py GeminiEmbedding._initialize_embeddings() - Error initializing Gemini embeddings: {str(e)}")
-            self._embeddings = None
-    
-    def get_model(self, **kwargs):
-        """Get the underlying GoogleGenerativeAIEmbeddings model object"""
-        if kwargs.get('model') and kwargs.get('model') != self.current_model:
-            self.current_model = kwargs.get('model')
-            self._initialize_embeddings()
-        
-        if not self._embeddings:
-            self._initialize_embeddings()
-            
-        return self._embeddings
-    
-    def embed_query(self, text: str) -> List[float]:
-        """Generate embeddings for a single text query"""
-        try:
-            embeddings = self.get_model()
-            
-            if not embeddings:
-                print(f"- ERROR - factory_embedding.py GeminiEmbedding.embed_query() - Failed to initialize Gemini embeddings")
-                return []
-                
-            return embeddings.embed_query(text)
-        except Exception as e:
-            print(f"- ERROR - factory_embedding.py GeminiEmbedding.embed_query() - Error generating embeddings from Gemini: {str(e)}")
-            return []
-    
-    def embed_documents(self, documents: List[str]) -> List[List[float]]:
-        """Generate embeddings for a list of documents"""
+        if self.spec.required:
+            return all(self._kwargs.get(kwarg) for kwarg in self.spec.required)
         try:
-            embeddings = self.get_model()
-            
-            if not embeddings:
-                print(f"- ERROR - factory_embedding.py GeminiEmbedding.embed_documents() - Failed to initialize Gemini embeddings")
-                return []
-                
-            return embeddings.embed_documents(documents)
-        except Exception as e:
-            print(f"- ERROR - factory_embedding.py GeminiEmbedding.embed_documents() - Error generating document embeddings from Gemini: {str(e)}")
-            return []
+            return self.get_model() is not None
+        except Exception:
+            return False
+
+def __getattr__(name: str):
+    """
+    Lazily import the LangChain embeddings classes of the registered providers (PEP 562)
     
-    def is_available(self) -> bool:
-        return bool(self.api_key)
+    The provider packages are only imported when a provider is first used; the class is then
+    stored as a module global, so later lookups no longer reach this function.
+    """
+    for spec in EMBEDDING_PROVIDERS.values():
+        module_name, class_name = spec.import_path.rsplit('.', 1)
+        if class_name == name:
+            ctor = getattr(importlib.import_module(module_name), class_name)
+            globals()[name] = ctor
+            return ctor
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 class EmbeddingModelFactory:
     """Factory class to produce embedding model objects based on configuration (Singleton)"""
     
     _instance = None
+    _init_lock = threading.Lock()
     
     def __new__(cls):
         """
         Create a singleton instance of the factory
         """
-        if cls._instance is None:
-            cls._instance = super(EmbeddingModelFactory, cls).__new__(cls)
-            cls._instance._initialized = False
+        with cls._init_lock:
+            if cls._instance is None:
+                cls._instance = super(EmbeddingModelFactory, cls).__new__(cls)
+                cls._instance._initialized = False
         return cls._instance
     
     def __init__(self):
         """
         Initialize the factory with configuration
         """
-        # Only initialize once
+        # Only initialize once; concurrent first calls wait for the one fetching the configuration
         if self._initialized:
             return
-
+        with self._init_lock:
+            if self._initialized:
+                return
+            self._initialize()
+    
+    def _initialize(self):
+        """
+        Fetch the configuration and set up the factory state, called once under _init_lock
+        """
         try:
             # Fetch configuration from HTTP endpoint
-            response = requests.get(CONFIG_EMBED_URL, timeout=5)
+            response = _fetch_config_response()
             if response.status_code == 200:
                 self.config = response.json().get('configs')
                 print(f"- INFO - factory_embedding.py EmbeddingModelFactory.__init__() - Configuration loaded from API: {CONFIG_EMBED_URL}")
@@ -258,6 +354,10 @@ class EmbeddingModelFactory:
             self.default_provider = self.config['GENERAL'].get('embedding_provider', '')
         else:
             self.default_provider = ''
+
+        # Embedding models already built, keyed by (provider_type, model name)
+        self._model_cache: Dict[tuple, EmbeddingModel] = {}
+        self._model_cache_lock = threading.Lock()
         self._initialized = True
     
     def get_current_model(self) -> Optional[str]:
@@ -293,29 +393,67 @@ class EmbeddingModelFactory:
         if provider_type is None:
             provider_type = self.default_provider
         
+        # Reuse the model built by an earlier call for the same provider and model
+        key = self._model_cache_key(provider_type)
+        with self._model_cache_lock:
+            model = self._model_cache.get(key)
+            if model is None:
+                model = self._build_embedding_model(provider_type)
+                if model is not None:
+                    self._model_cache[key] = model
+        return model
+    
+    def _model_cache_key(self, provider_type: str) -> tuple:
+        """Build the model cache key from the provider type and its configured model name"""
+        section = self.config.get({'ollama': 'OLLAMA', 'gemini': 'GEMINI', 'azure': 'AZURE'}.get(provider_type, ''), {})
+        model_name = section.get('embedding_model') or section.get('embedding_deployment') or section.get('model_name')
+        return (provider_type, model_name)
+    
+    def _build_embedding_model(self, provider_type: str) -> Optional[EmbeddingModel]:
+        """
+        Build an embedding model of the specified type, falling back to the default or any available provider
+        
+        Args:
+            provider_type: Type of embedding provider to create ('ollama', 'gemini', 'azure')
+        
+        Returns:
+            An embedding model instance or None if no model could be created
+        """
         provider_map = {
             'ollama': self._create_ollama_embedding,
             'gemini': self._create_gemini_embedding,
             'azure': self._create_azure_openai_embedding
         }
         
-        # Try to create the specified provider
-        if provider_type in provider_map:
-            model = provider_map[provider_type]()
-            if model and getattr(model, 'is_available', lambda: True)():
-                return model
+        # Candidates in priority order: the specified provider, the default, then any other provider
+        candidates = []
+        for name in [provider_type, self.default_provider, *provider_map.keys()]:
+            if name in provider_map and name not in candidates:
+                candidates.append(name)
+        if not candidates:
+            return None
         
-        # If specified provider couldn't be created, try the default
-        if provider_type != self.default_provider and self.default_provider in provider_map:
-            model = provider_map[self.default_provider]()
-            if model and getattr(model, 'is_available', lambda: True)():
-                return model
-                
-        # If default provider couldn't be created, try any available provider
-        for provider_func in provider_map.values():
-            model = provider_func()
-            if model and getattr(model, 'is_available', lambda: True)():
+        def _probe(name: str) -> Optional[EmbeddingModel]:
+            model = provider_map[name]()
+            if model and model.is_available():
                 return model
+            return None
+        
+        # Probe all candidates concurrently, then take the first available one in priority order
+        executor = ThreadPoolExecutor(max_workers=len(candidates))
+        try:
+            futures = [executor.submit(_probe, name) for name in candidates]
+            for name, future in zip(candidates, futures):
+                try:
+                    model = future.result()
+                except Exception as e:
+                    print(f"- ERROR - factory_embedding.py EmbeddingModelFactory._build_embedding_model() - Error probing {name} embedding: {e}")
+                    continue
+                if model is not None:
+                    return model
+        finally:
+            # Do not wait for lower-priority probes once a model has been chosen
+            executor.shutdown(wait=False, cancel_futures=True)
         
         return None
     
@@ -323,22 +461,22 @@ class EmbeddingModelFactory:
         """Create an Ollama embedding model if configuration exists"""
         if 'OLLAMA' in self.config:
             config_dict = self.config['OLLAMA']
-            return OllamaEmbedding(config_dict)
-        return OllamaEmbedding({})  # Use defaults
+            return LangchainEmbedding(EMBEDDING_PROVIDERS['ollama'], config_dict)
+        return LangchainEmbedding(EMBEDDING_PROVIDERS['ollama'], {})  # Use defaults
     
     def _create_gemini_embedding(self) -> Optional[EmbeddingModel]:
         """Create a Gemini embedding model if configuration exists"""
         if 'GEMINI' in self.config:
             config_dict = self.config['GEMINI']
-            return GeminiEmbedding(config_dict)
+            return LangchainEmbedding(EMBEDDING_PROVIDERS['gemini'], config_dict)
         return None
     
     def _create_azure_openai_embedding(self) -> Optional[EmbeddingModel]:
         """Create an Azure OpenAI embedding model if configuration exists"""
         if 'AZURE' in self.config:
             config_dict = self.config['AZURE']
-            # No need to convert to uppercase as the class handles lowercase keys
-            return AzureOpenAIEmbedding(config_dict)
+            # No need to convert to uppercase as the provider spec uses lowercase keys
+            return LangchainEmbedding(EMBEDDING_PROVIDERS['azure'], config_dict)
         return None
     
 
@@ -1,11 +1,81 @@
+import asyncio
+import hashlib
 import requests
+import threading
+import time
+from collections import OrderedDict
 from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor, wait
+from requests.adapters import HTTPAdapter
+from urllib3.util import Retry
 from typing import Dict, Any, Optional, List
 from .endpoint import endpoint_url
 
+# LangChain provider classes, imported once; a provider whose package is missing is left as None
+try:
+    from langchain_ollama import OllamaLLM
+except ImportError:
+    OllamaLLM = None
+try:
+    from langchain_google_genai import ChatGoogleGenerativeAI
+except ImportError:
+    ChatGoogleGenerativeAI = None
+try:
+    from langchain_openai import AzureChatOpenAI
+except ImportError:
+    AzureChatOpenAI = None
+try:
+    from langchain_core.messages import HumanMessage
+except ImportError:
+    HumanMessage = None
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
 # HTTP Endpoint
 CONFIG_FACTORY_URL = endpoint_url + "config_factory"
 
+# Shared keep-alive session for configuration fetches and availability probes
+_http = requests.Session()
+_http.headers.update({'Connection': 'keep-alive'})
+# Availability probes fail fast: a retried probe of an offline host would take several timeouts
+_http_adapter = HTTPAdapter(pool_connections=10, pool_maxsize=20, max_retries=0)
+_http.mount('http://', _http_adapter)
+_http.mount('https://', _http_adapter)
+# Only the configuration fetch is retried; the longer URL prefix takes precedence over the ones above
+_http.mount(CONFIG_FACTORY_URL, HTTPAdapter(max_retries=Retry(total=3, backoff_factor=0.2)))
+
+# Shared async client for availability probes from inside the event loop, created on first use
+_async_http = None
+
+def _get_async_http():
+    """Return the shared httpx.AsyncClient, creating it on first use"""
+    global _async_http
+    if _async_http is None:
+        _async_http = httpx.AsyncClient(http2=True, timeout=3.0, limits=httpx.Limits(max_keepalive_connections=10))
+    return _async_http
+
+async def close_async_http() -> None:
+    """Close the shared httpx.AsyncClient if it was created"""
+    global _async_http
+    if _async_http is not None:
+        await _async_http.aclose()
+        _async_http = None
+
+# Seconds an is_available() result is reused before the executor is probed again
+AVAILABILITY_TTL = 30.0
+
+# Shared pool for concurrent availability probes, and the overall time allowed for one round of probes
+_PROBE_POOL = ThreadPoolExecutor(max_workers=4, thread_name_prefix="llm-probe")
+PROBE_TIMEOUT = 4.0
+
+# Seconds after which refresh_if_stale() fetches the factory configuration again
+CONFIG_TTL = 300.0
+
+# Responses kept per executor for repeated prompts; all executors run with temperature=0
+RESPONSE_CACHE_SIZE = 256
+
 class LLMExecutor(ABC):
     """Abstract base class for LLM executors"""
     
@@ -15,14 +85,50 @@ class LLMExecutor(ABC):
         pass
 
     @abstractmethod
-    def get_model(self, **kwargs):
-        """Get the underlying LLM model object"""
+    def _build_llm(self, model: str):
+        """Build the LangChain LLM object for the given model name, or return None on failure"""
         pass
+    
+    def get_model(self, **kwargs):
+        """Get the underlying LLM model object, building it once per model name"""
+        model = kwargs.get('model') or self.current_model
+        llm = self._llm_cache.get(model)
+        if llm is None:
+            llm = self._build_llm(model)
+            if llm is not None:
+                self._llm_cache[model] = llm
+            
+        return llm
 
     @abstractmethod
     def is_available(self) -> bool:
         """Check if the LLM is available for use"""
         pass
+    
+    async def is_available_async(self) -> bool:
+        """Check if the LLM is available for use without blocking the event loop"""
+        return self.is_available()
+    
+    def _response_key(self, prompt: str, **kwargs) -> tuple:
+        """Build the response cache key from the model name and a digest of the prompt"""
+        model = kwargs.get('model') or self.current_model
+        return (model, hashlib.blake2b(prompt.encode('utf-8'), digest_size=16).digest())
+    
+    def _get_cached_response(self, key: tuple) -> Optional[str]:
+        """Return the cached response for key, or None on a miss"""
+        with self._response_lock:
+            response = self._response_cache.get(key)
+            if response is not None:
+                self._response_cache.move_to_end(key)
+            return response
+    
+    def _cache_response(self, key: tuple, response: str) -> None:
+        """Store a response, evicting the least recently used one when the cache is full"""
+        with self._response_lock:
+            self._response_cache[key] = response
+            self._response_cache.move_to_end(key)
+            if len(self._response_cache) > RESPONSE_CACHE_SIZE:
+                self._response_cache.popitem(last=False)
 
 class OllamaExecutor(LLMExecutor):
     """LLM executor for Ollama using LangChain"""
@@ -31,48 +137,59 @@ class OllamaExecutor(LLMExecutor):
         self.host = config.get('HOST', 'http://localhost:11434')
         self.model = config.get('MODEL', 'llama2')
         self.current_model = self.model
-        self._llm = None
+        # LangChain LLM objects already built, keyed by model name
+        self._llm_cache: Dict[str, Any] = {}
+        # LRU of generated responses, keyed by (model name, prompt digest)
+        self._response_cache: OrderedDict = OrderedDict()
+        self._response_lock = threading.Lock()
     
-    def _initialize_llm(self):
+    def _build_llm(self, model: str):
         try:
-            from langchain_ollama import OllamaLLM
+            if OllamaLLM is None:
+                raise RuntimeError("langchain_ollama is not installed")
             
-            self._llm = OllamaLLM(
+            return OllamaLLM(
                 base_url=self.host,
-                model=self.current_model,
+                model=model,
                 temperature=0
             )
         except Exception as e:
-            print(f"- ERROR - factory_llm.py OllamaExecutor._initialize_llm() - Error initializing Ollama LLM: {str(e)}")
-            self._llm = None
-    
-    def get_model(self, **kwargs):
-        """Get the underlying OllamaLLM model object"""
-        if kwargs.get('model') and kwargs.get('model') != self.current_model:
-            self.current_model = kwargs.get('model')
-            self._initialize_llm()
-        
-        if not self._llm:
-            self._initialize_llm()
-            
-        return self._llm
+            print(f"- ERROR - factory_llm.py OllamaExecutor._build_llm() - Error initializing Ollama LLM: {str(e)}")
+            return None
     
     def generate_response(self, prompt: str, **kwargs) -> str:
         try:
+            # Identical prompts to the same model are answered from the response cache
+            key = self._response_key(prompt, **kwargs) if kwargs.pop('use_cache', True) else None
+            if key is not None:
+                cached = self._get_cached_response(key)
+                if cached is not None:
+                    return cached
+            
             llm = self.get_model(**kwargs)
             
             if not llm:
                 return f"- ERROR - factory_llm.py OllamaExecutor.generate_response() - Failed to initialize Ollama LLM"
                 
             response = llm.invoke(prompt)
+            if key is not None:
+                self._cache_response(key, response)
             return response
         except Exception as e:
             return f"- ERROR - factory_llm.py OllamaExecutor.generate_response() - Error generating response from Ollama: {str(e)}"
     
     def is_available(self) -> bool:
         try:
-            import requests
-            response = requests.get(f"{self.host}/api/tags", timeout=3)
+            response = _http.get(f"{self.host}/api/tags", timeout=3)
+            return response.status_code == 200
+        except Exception:
+            return False
+    
+    async def is_available_async(self) -> bool:
+        if httpx is None:
+            return await asyncio.to_thread(self.is_available)
+        try:
+            response = await _get_async_http().get(f"{self.host}/api/tags")
             return response.status_code == 200
         except Exception:
             return False
@@ -84,42 +201,43 @@ class GeminiExecutor(LLMExecutor):
         self.api_key = config.get('API_KEY', '')
         self.model = config.get('MODEL', 'gemini-pro')
         self.current_model = self.model
-        self._llm = None
+        # LangChain LLM objects already built, keyed by model name
+        self._llm_cache: Dict[str, Any] = {}
+        # LRU of generated responses, keyed by (model name, prompt digest)
+        self._response_cache: OrderedDict = OrderedDict()
+        self._response_lock = threading.Lock()
     
-    def _initialize_llm(self):
+    def _build_llm(self, model: str):
         try:
-            from langchain_google_genai import ChatGoogleGenerativeAI
+            if ChatGoogleGenerativeAI is None:
+                raise RuntimeError("langchain_google_genai is not installed")
             
-            self._llm = ChatGoogleGenerativeAI(
-                model=self.current_model,
+            return ChatGoogleGenerativeAI(
+                model=model,
                 google_api_key=self.api_key,
                 temperature=0                
             )
         except Exception as e:
-            print(f"- ERROR - factory_llm.py GeminiExecutor._initialize_llm() - Error initializing Gemini LLM: {str(e)}")
-            self._llm = None
-    
-    def get_model(self, **kwargs):
-        """Get the underlying ChatGoogleGenerativeAI model object"""
-        if kwargs.get('model') and kwargs.get('model') != self.current_model:
-            self.current_model = kwargs.get('model')
-            self._initialize_llm()
-        
-        if not self._llm:
-            self._initialize_llm()
-            
-        return self._llm
+            print(f"- ERROR - factory_llm.py GeminiExecutor._build_llm() - Error initializing Gemini LLM: {str(e)}")
+            return None
     
     def generate_response(self, prompt: str, **kwargs) -> str:
         try:
+            # Identical prompts to the same model are answered from the response cache
+            key = self._response_key(prompt, **kwargs) if kwargs.pop('use_cache', True) else None
+            if key is not None:
+                cached = self._get_cached_response(key)
+                if cached is not None:
+                    return cached
+            
             llm = self.get_model(**kwargs)
             
             if not llm:
                 return f"- ERROR - factory_llm.py GeminiExecutor.generate_response() - Failed to initialize Gemini LLM"
                 
-            from langchain.schema import HumanMessage
-            
             response = llm.invoke([HumanMessage(content=prompt)])
+            if key is not None:
+                self._cache_response(key, response.content)
             return response.content
         except Exception as e:
             return f"- ERROR - factory_llm.py GeminiExecutor.generate_response() - Error generating response from Gemini: {str(e)}"
@@ -136,45 +254,46 @@ class AzureOpenAIExecutor(LLMExecutor):
         self.api_version = config.get('VERSION', '2023-05-15')
         self.model = config.get('MODEL', 'gpt-4')
         self.current_model = self.model
-        self._llm = None
+        # LangChain LLM objects already built, keyed by model name
+        self._llm_cache: Dict[str, Any] = {}
+        # LRU of generated responses, keyed by (model name, prompt digest)
+        self._response_cache: OrderedDict = OrderedDict()
+        self._response_lock = threading.Lock()
     
-    def _initialize_llm(self):
+    def _build_llm(self, model: str):
         try:
-            from langchain_openai import AzureChatOpenAI
+            if AzureChatOpenAI is None:
+                raise RuntimeError("langchain_openai is not installed")
             
-            self._llm = AzureChatOpenAI(
+            return AzureChatOpenAI(
                 azure_endpoint=self.endpoint,
-                azure_deployment=self.current_model,
+                azure_deployment=model,
                 api_key=self.api_key,
                 api_version=self.api_version,
                 temperature=0,
                 max_retries=3
             )
         except Exception as e:
-            print(f"- ERROR - factory_llm.py AzureOpenAIExecutor._initialize_llm() - Error initializing Azure OpenAI LLM: {str(e)}")
-            self._llm = None
-    
-    def get_model(self, **kwargs):
-        """Get the underlying AzureChatOpenAI model object"""
-        if kwargs.get('model') and kwargs.get('model') != self.current_model:
-            self.current_model = kwargs.get('model')
-            self._initialize_llm()
-        
-        if not self._llm:
-            self._initialize_llm()
-            
-        return self._llm
+            print(f"- ERROR - factory_llm.py AzureOpenAIExecutor._build_llm() - Error initializing Azure OpenAI LLM: {str(e)}")
+            return None
     
     def generate_response(self, prompt: str, **kwargs) -> str:
         try:
+            # Identical prompts to the same model are answered from the response cache
+            key = self._response_key(prompt, **kwargs) if kwargs.pop('use_cache', True) else None
+            if key is not None:
+                cached = self._get_cached_response(key)
+                if cached is not None:
+                    return cached
+            
             llm = self.get_model(**kwargs)
             
             if not llm:
                 return f"- ERROR - factory_llm.py AzureOpenAIExecutor.generate_response() - Failed to initialize Azure OpenAI LLM"
                 
-            from langchain.schema import HumanMessage
-            
             response = llm.invoke([HumanMessage(content=prompt)])
+            if key is not None:
+                self._cache_response(key, response.content)
             return response.content
         except Exception as e:
             return f"- ERROR - factory_llm.py AzureOpenAIExecutor.generate_response() - Error generating response from Azure OpenAI: {str(e)}"
@@ -186,43 +305,151 @@ class LLMExecutorFactory:
     """Factory class to produce LLM executor objects based on configuration (Singleton)"""
     
     _instance = None
+    _init_lock = threading.Lock()
     
     def __new__(cls):
         """
         Create a singleton instance of the factory
         
         """
+        # Double-checked locking: only the first calls contend for the lock
         if cls._instance is None:
-            cls._instance = super(LLMExecutorFactory, cls).__new__(cls)
-            cls._instance._initialized = False
+            with cls._init_lock:
+                if cls._instance is None:
+                    cls._instance = super(LLMExecutorFactory, cls).__new__(cls)
+                    cls._instance._initialized = False
         return cls._instance
     
     def __init__(self):
         """
-        Initialize the factory with configuration
-        
-        Args:
-            config_path: Path to the configuration file. If None, looks for config_factory.ini in the same directory
+        Initialize the factory; the configuration is fetched on first use
         """
         # Only initialize once
         if self._initialized:
             return
+        with self._init_lock:
+            if self._initialized:
+                return
+
+            self._config: Optional[Dict[str, Any]] = None
+            self._config_loaded_at = 0.0
 
+            # Default executor to use if available
+            self.default_executor = 'ollama'
+            # Recent availability results: (executor_type, host/endpoint) -> (monotonic timestamp, available)
+            self._availability: Dict[tuple, tuple] = {}
+            self._initialized = True
+    
+    @property
+    def config(self) -> Dict[str, Any]:
+        """The factory configuration, fetched from the configuration API on first access"""
+        if self._config is None:
+            # Concurrent first accesses wait for the one fetching the configuration
+            with self._init_lock:
+                if self._config is None:
+                    self._load_config()
+        return self._config
+    
+    def _load_config(self) -> None:
+        """
+        Fetch the configuration from the configuration API, called under _init_lock
+        
+        A failed fetch keeps the last configuration that was loaded successfully; without one,
+        it falls back to an empty configuration, so the factory still works with executor
+        defaults instead of failing on a missing attribute. Either way the next attempt is
+        made once the configuration is stale again.
+        """
+        config = None
         try:
             # Fetch configuration from HTTP endpoint
-            response = requests.get(CONFIG_FACTORY_URL, timeout=3)
+            response = _http.get(CONFIG_FACTORY_URL, timeout=3)
             if response.status_code == 200:
-                self.config = response.json().get('configs')
-                print(f"- INFO - factory_llm.py LLMExecutorFactory.__init__() - Configuration loaded from API: {CONFIG_FACTORY_URL}")
+                raw_config = response.json().get('configs') or {}
+                # Convert lowercase keys to uppercase for API compatibility, once per load
+                config = {section: {k.upper(): v for k, v in values.items()} for section, values in raw_config.items()}
+                print(f"- INFO - factory_llm.py LLMExecutorFactory._load_config() - Configuration loaded from API: {CONFIG_FACTORY_URL}")
                 
             else:
-                print(f"- ERROR - factory_llm.py LLMExecutorFactory.__init__() - Failed to fetch configuration from API: {response.status_code}")
+                print(f"- ERROR - factory_llm.py LLMExecutorFactory._load_config() - Failed to fetch configuration from API: {response.status_code}")
         except Exception as e:
-            print(f"- ERROR - factory_llm.py LLMExecutorFactory.__init__() - Error fetching configuration from API: {e}")
-
-        # Default executor to use if available
-        self.default_executor = 'ollama'
-        self._initialized = True
+            print(f"- ERROR - factory_llm.py LLMExecutorFactory._load_config() - Error fetching configuration from API: {e}")
+        
+        if config is not None:
+            self._config = config
+        elif self._config is None:
+            self._config = {}
+        self._config_loaded_at = time.monotonic()
+    
+    def refresh_if_stale(self, ttl: float = CONFIG_TTL) -> bool:
+        """
+        Fetch the configuration again if it is older than ttl seconds
+        
+        Args:
+            ttl: Maximum age of the configuration in seconds
+        
+        Returns:
+            True if the configuration was reloaded, False otherwise
+        """
+        if self._config is not None and time.monotonic() - self._config_loaded_at < ttl:
+            return False
+        # Concurrent callers wait for the one reloading instead of fetching again themselves
+        with self._init_lock:
+            if self._config is not None and time.monotonic() - self._config_loaded_at < ttl:
+                return False
+            self._load_config()
+        self.refresh()
+        return True
+    
+    def _is_available(self, executor_type: str, executor: LLMExecutor) -> bool:
+        """
+        Check if an executor is available, reusing a result younger than AVAILABILITY_TTL
+        
+        Args:
+            executor_type: Type of the executor ('ollama', 'gemini', 'azure')
+            executor: The executor to check
+        
+        Returns:
+            True if the executor is available, False otherwise
+        """
+        key = self._availability_key(executor_type, executor)
+        now = time.monotonic()
+        cached = self._availability.get(key)
+        if cached is not None and now - cached[0] < AVAILABILITY_TTL:
+            return cached[1]
+        
+        available = executor.is_available()
+        self._availability[key] = (now, available)
+        return available
+    
+    async def _is_available_async(self, executor_type: str, executor: LLMExecutor) -> bool:
+        """
+        Async variant of _is_available sharing the same TTL cache
+        
+        Args:
+            executor_type: Type of the executor ('ollama', 'gemini', 'azure')
+            executor: The executor to check
+        
+        Returns:
+            True if the executor is available, False otherwise
+        """
+        key = self._availability_key(executor_type, executor)
+        now = time.monotonic()
+        cached = self._availability.get(key)
+        if cached is not None and now - cached[0] < AVAILABILITY_TTL:
+            return cached[1]
+        
+        available = await executor.is_available_async()
+        self._availability[key] = (now, available)
+        return available
+    
+    @staticmethod
+    def _availability_key(executor_type: str, executor: LLMExecutor) -> tuple:
+        """Key of the availability cache: executor type plus the host or endpoint it talks to"""
+        return (executor_type, getattr(executor, 'host', None) or getattr(executor, 'endpoint', ''))
+    
+    def refresh(self) -> None:
+        """Forget the cached availability results so the next checks probe the executors again"""
+        self._availability.clear()
     
     def create_executor(self, executor_type: str = None) -> Optional[LLMExecutor]:
         """
@@ -247,46 +474,45 @@ class LLMExecutorFactory:
         # Try to create the specified executor
         if executor_type in executor_map:
             executor = executor_map[executor_type]()
-            if executor and executor.is_available():
+            if executor and self._is_available(executor_type, executor):
                 return executor
         
         # If the specified executor is not available, try each one in order
         if executor_type != 'auto':
             return self.create_executor('auto')
         
-        # Try each executor in order
-        for create_func in executor_map.values():
+        def _probe(name: str, create_func) -> Optional[LLMExecutor]:
             executor = create_func()
-            if executor and executor.is_available():
+            return executor if executor and self._is_available(name, executor) else None
+        
+        # Probe all executors concurrently, then take the first available one in priority order;
+        # the wait is bounded by the slowest probe instead of the sum of all probes
+        futures = [_PROBE_POOL.submit(_probe, name, create_func) for name, create_func in executor_map.items()]
+        deadline = time.monotonic() + PROBE_TIMEOUT
+        for future in futures:
+            try:
+                executor = future.result(timeout=max(0.0, deadline - time.monotonic()))
+            except Exception:
+                continue
+            if executor is not None:
                 return executor
         
         return None
     
     def _create_ollama_executor(self) -> Optional[LLMExecutor]:
         """Create an Ollama executor if configuration exists"""
-        if 'Ollama' in self.config:
-            config_dict = self.config['Ollama']
-            # Convert lowercase keys to uppercase for API compatibility
-            config_dict = {k.upper(): v for k, v in config_dict.items()}
-            return OllamaExecutor(config_dict)
-        return OllamaExecutor({})  # Use defaults
+        return OllamaExecutor(self.config.get('Ollama', {}))  # Use defaults when not configured
     
     def _create_gemini_executor(self) -> Optional[LLMExecutor]:
         """Create a Gemini executor if configuration exists"""
         if 'Gemini' in self.config:
-            config_dict = self.config['Gemini']
-            # Convert lowercase keys to uppercase for API compatibility
-            config_dict = {k.upper(): v for k, v in config_dict.items()}
-            return GeminiExecutor(config_dict)
+            return GeminiExecutor(self.config['Gemini'])
         return None
     
     def _create_azure_openai_executor(self) -> Optional[LLMExecutor]:
         """Create an Azure OpenAI executor if configuration exists"""
         if 'AzureOpenAI' in self.config:
-            config_dict = self.config['AzureOpenAI']
-            # Convert lowercase keys to uppercase for API compatibility
-            config_dict = {k.upper(): v for k, v in config_dict.items()}
-            return AzureOpenAIExecutor(config_dict)
+            return AzureOpenAIExecutor(self.config['AzureOpenAI'])
         return None
     
     def get_available_executors(self) -> List[str]:
@@ -304,15 +530,47 @@ class LLMExecutorFactory:
             'azure': self._create_azure_openai_executor
         }
         
-        for name, create_func in executor_types.items():
+        def _probe(name: str, create_func) -> bool:
+            executor = create_func()
+            return bool(executor and self._is_available(name, executor))
+        
+        # Probe all executors concurrently; a probe still running after PROBE_TIMEOUT counts as unavailable
+        futures = {name: _PROBE_POOL.submit(_probe, name, create_func) for name, create_func in executor_types.items()}
+        done, _ = wait(futures.values(), timeout=PROBE_TIMEOUT)
+        
+        for name, future in futures.items():
             try:
-                executor = create_func()
-                if executor and executor.is_available():
+                if future in done and future.result():
                     available.append(name)
             except Exception:
                 pass
         
         return available
+    
+    async def get_available_executors_async(self) -> List[str]:
+        """
+        Get a list of available executor types without blocking the event loop
+        
+        Returns:
+            List of available executor type names
+        """
+        executor_types = {
+            'ollama': self._create_ollama_executor,
+            'gemini': self._create_gemini_executor,
+            'azure': self._create_azure_openai_executor
+        }
+        
+        async def _probe(name: str, create_func) -> bool:
+            executor = create_func()
+            return bool(executor and await self._is_available_async(name, executor))
+        
+        # Probe all executors concurrently; a probe still running after PROBE_TIMEOUT counts as unavailable
+        results = await asyncio.gather(
+            *(asyncio.wait_for(_probe(name, create_func), PROBE_TIMEOUT) for name, create_func in executor_types.items()),
+            return_exceptions=True
+        )
+        
+        return [name for name, result in zip(executor_types, results) if result is True]
 
 # Example usage:
 if __name__ == "__main__":
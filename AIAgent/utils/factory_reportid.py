@@ -1,40 +1,74 @@
+import logging
+import os
 import re
+import threading
+import time
 from datetime import datetime
 from typing import Dict, Any, Optional
 from .util_mongodb import MongoDBHandler
 
+# Per-call messages go to a debug logger so they cost nothing unless debug logging is enabled
+logger = logging.getLogger(__name__)
+
+# Report ID format: REP-YYYYMMDD-XXXX where XXXX is the sequence
+_SEQ_RE = re.compile(r'REP-\d{8}-(\d+)$')
+
+# Collection holding one sequence counter document per day: {"_id": "YYYYMMDD", "seq": int}
+REPORT_COUNTER_COLLECTION = "ReportIDCounters"
+
+# Sequence numbers reserved from the counter per round trip; unused numbers of a block are skipped
+REPORT_ID_BLOCK_SIZE = max(1, int(os.environ.get("REPORT_ID_BLOCK_SIZE", 10)))
+
 class ReportIDFactory:
     """
     A singleton class responsible for generating unique report IDs.
-    Before generating a new ID, it checks the latest report ID in the 
-    LogAnalysisResults collection in MongoDB.
+    The daily sequence number is taken from an atomic counter in MongoDB, so
+    concurrent callers (also in other processes) never receive the same ID.
     """
     _instance = None
+    _init_lock = threading.Lock()
     
     def __new__(cls, *args, **kwargs):
         """
         Create a singleton instance of the factory
         """
+        # Double-checked locking: only the first calls contend for the lock
         if cls._instance is None:
-            cls._instance = super(ReportIDFactory, cls).__new__(cls)
-            cls._instance._initialized = False
+            with cls._init_lock:
+                if cls._instance is None:
+                    cls._instance = super(ReportIDFactory, cls).__new__(cls)
+                    cls._instance._initialized = False
         return cls._instance
     
     def __init__(self, mongo_handler: Optional[MongoDBHandler] = None):
         """
         Initialize the ReportIDFactory
         """
-        # Only initialize once
+        # Only initialize once; concurrent first calls wait for the one connecting to MongoDB
         if self._initialized:
             return
-        
-        try:
-            self.mongo_handler = mongo_handler if mongo_handler else MongoDBHandler()
-            self._initialized = True
-            print(f"- INFO - factory_reportid.py ReportIDFactory.__init__() - ReportIDFactory initialized successfully")
-        except Exception as e:
-            print(f"- ERROR - factory_reportid.py ReportIDFactory.__init__() - Failed to initialize ReportIDFactory: {e}")
-            raise
+        with self._init_lock:
+            if self._initialized:
+                return
+            
+            try:
+                self.mongo_handler = mongo_handler if mongo_handler else MongoDBHandler()
+                # Report IDs must stay unique even if old and new generators run side by side;
+                # the same index also serves the latest-ID lookup in _get_latest_report_id
+                if not self.mongo_handler.create_index("LogAnalysisResults", [("report_id", 1)], unique=True):
+                    # Typically duplicate IDs left by the previous generator; new IDs are still taken
+                    # from the atomic counter, but the database no longer rejects a duplicate
+                    print(f"- ERROR - factory_reportid.py ReportIDFactory.__init__() - Unique index on LogAnalysisResults.report_id is not in place; duplicate report IDs will not be rejected")
+                # Day for which the counter was last aligned with the existing report IDs
+                self._seeded_day: Optional[str] = None
+                # Reserved block of today's sequence numbers: day -> (next sequence, last reserved sequence)
+                self._seq_cache: Dict[str, tuple] = {}
+                self._seq_lock = threading.Lock()
+                self._initialized = True
+                print(f"- INFO - factory_reportid.py ReportIDFactory.__init__() - ReportIDFactory initialized successfully")
+            except Exception as e:
+                print(f"- ERROR - factory_reportid.py ReportIDFactory.__init__() - Failed to initialize ReportIDFactory: {e}")
+                raise
     
     def _get_latest_report_id(self) -> Optional[str]:
         """
@@ -48,18 +82,18 @@ class ReportIDFactory:
             # We only need the report_id field, so use projection
             results = self.mongo_handler.query_data(
                 collection_name="LogAnalysisResults",
-                query={},
+                # Only IDs in the real format; the anchored "REP-" prefix still bounds the index scan,
+                # and REPERR- or legacy REP-YYYYMMDD-ERROR fallbacks are skipped
+                query={"report_id": {"$regex": r"^REP-\d{8}-\d+$"}},
                 projection={"report_id": 1, "_id": 0},
                 limit=1,
-                sort=[("report_id", -1)]  # Sort in descending order
+                sort=[("report_id", -1)]  # Sort in descending order, walking the report_id index when present
             )
             
-            if results and len(results) > 0 and "report_id" in results[0]:
-                latest_id = results[0]["report_id"]
-                print(f"- INFO - factory_reportid.py ReportIDFactory._get_latest_report_id() - Latest report ID found: {latest_id}")
-                return latest_id
-            else:
-                print(f"- INFO - factory_reportid.py ReportIDFactory._get_latest_report_id() - No existing report IDs found")
+            try:
+                return results[0]["report_id"]
+            except (IndexError, KeyError, TypeError):
+                # No existing report IDs
                 return None
                 
         except Exception as e:
@@ -76,18 +110,32 @@ class ReportIDFactory:
         Returns:
             int: The sequence number or 0 if parsing fails
         """
-        try:
-            # Assuming report ID format is: REP-YYYYMMDD-XXXX where XXXX is the sequence
-            match = re.search(r'REP-\d{8}-(\d+)', report_id)
-            if match:
-                return int(match.group(1))
-            return 0
-        except Exception:
-            return 0
+        match = _SEQ_RE.search(report_id)
+        return int(match.group(1)) if match else 0
+    
+    def _seed_counter(self, today: str) -> None:
+        """
+        Make sure today's counter is not behind report IDs created before the counter existed
+        
+        Args:
+            today: The current date in YYYYMMDD format
+        """
+        latest_id = self._get_latest_report_id()
+        # REP-YYYYMMDD-XXXX: the date sits at a fixed offset, so compare the slice directly
+        if latest_id and latest_id[4:12] == today:
+            seq_part = latest_id[13:]
+            # Fall back to the regex only for IDs that do not follow the format
+            sequence_number = int(seq_part) if seq_part.isdigit() else self._extract_sequence_number(latest_id)
+            self.mongo_handler.update_data(
+                REPORT_COUNTER_COLLECTION,
+                query={"_id": today},
+                update_data={"$max": {"seq": sequence_number}},
+                upsert=True
+            )
     
     def generate_report_id(self) -> str:
         """
-        Generate a unique report ID based on the current date and the latest ID in the database
+        Generate a unique report ID based on the current date and today's atomic counter in the database
         
         Returns:
             str: A new unique report ID
@@ -96,28 +144,39 @@ class ReportIDFactory:
             # Get today's date in YYYYMMDD format
             today = datetime.now().strftime('%Y%m%d')
             
-            # Get the latest report ID from MongoDB
-            latest_id = self._get_latest_report_id()
-            
-            # Default starting sequence number
-            sequence_number = 1
-            
-            if latest_id:
-                # Check if the latest report is from today
-                if today in latest_id:
-                    # Extract the sequence number and increment it
-                    sequence_number = self._extract_sequence_number(latest_id) + 1
+            with self._seq_lock:
+                # Align the counter with existing reports once per day
+                if self._seeded_day != today:
+                    self._seed_counter(today)
+                    self._seeded_day = today
+                    self._seq_cache.clear()
+                
+                sequence_number, last_reserved = self._seq_cache.get(today, (1, 0))
+                if sequence_number > last_reserved:
+                    # Block used up: atomically reserve the next block from today's counter
+                    counter = self.mongo_handler.find_one_and_update(
+                        REPORT_COUNTER_COLLECTION,
+                        query={"_id": today},
+                        update_data={"$inc": {"seq": REPORT_ID_BLOCK_SIZE}},
+                        upsert=True
+                    )
+                    if counter is None:
+                        raise RuntimeError("Failed to increment the report ID counter")
+                    last_reserved = counter["seq"]
+                    sequence_number = last_reserved - REPORT_ID_BLOCK_SIZE + 1
+                self._seq_cache[today] = (sequence_number + 1, last_reserved)
             
             # Format: REP-YYYYMMDD-XXXX (XXXX is zero-padded sequence number)
             new_report_id = f"REP-{today}-{sequence_number:04d}"
             
-            print(f"- INFO - factory_reportid.py ReportIDFactory.generate_report_id() - Generated new report ID: {new_report_id}")
+            logger.debug("- DEBUG - factory_reportid.py ReportIDFactory.generate_report_id() - Generated new report ID: %s", new_report_id)
             return new_report_id
             
         except Exception as e:
             print(f"- ERROR - factory_reportid.py ReportIDFactory.generate_report_id() - Failed to generate report ID: {e}")
-            # Fallback report ID in case of error
-            fallback_id = f"REP-{datetime.now().strftime('%Y%m%d')}-ERROR"
+            # Fallback report ID in case of error; the separate REPERR prefix keeps it out of
+            # the REP- ordering used to seed the counter, and the suffix keeps fallbacks distinct
+            fallback_id = f"REPERR-{datetime.now().strftime('%Y%m%d')}-{time.time_ns() % 10000:04d}"
             return fallback_id
     
     def register_report_id(self, report_data: Dict[str, Any]) -> bool:
@@ -146,7 +205,7 @@ class ReportIDFactory:
             )
             
             if success:
-                print(f"- INFO - factory_reportid.py ReportIDFactory.register_report_id() - Report ID registered successfully: {report_data['report_id']}")
+                logger.debug("- DEBUG - factory_reportid.py ReportIDFactory.register_report_id() - Report ID registered successfully: %s", report_data['report_id'])
             else:
                 print(f"- ERROR - factory_reportid.py ReportIDFactory.register_report_id() - Failed to register report ID: {report_data['report_id']}")
             
@@ -1,27 +1,155 @@
+import asyncio
+import itertools
+import logging
+import os
 import pymongo
 import requests
-from typing import Dict, List, Any, Union
+import threading
+import time
+from pymongo import DeleteOne, IndexModel, InsertOne, UpdateOne
+from pymongo.results import BulkWriteResult
+from typing import Dict, List, Any, Iterator, Optional, Union
 from .endpoint import endpoint_url
 
 # HTTP Endpoint
 CONFIG_FACTORY_URL = endpoint_url + "config_mongodb"
 
+# Per-call messages go to a debug logger so they cost nothing unless debug logging is enabled
+logger = logging.getLogger(__name__)
+
+# Connection pool bounds; the minimum keeps a few sockets warm so single calls skip the connect handshake
+MONGO_MAX_POOL_SIZE = 50
+MONGO_MIN_POOL_SIZE = 5
+
+# Wire compression offered to the server in order of preference; the driver uses the first one both sides support
+MONGO_COMPRESSORS = "zstd,zlib"
+MONGO_ZLIB_LEVEL = 6
+
+# Document lists longer than INSERT_CHUNK_THRESHOLD are written as bulk_write batches of INSERT_CHUNK_SIZE;
+# the async handler keeps up to INSERT_CHUNK_CONCURRENCY of those batches in flight
+INSERT_CHUNK_SIZE = 1000
+INSERT_CHUNK_THRESHOLD = 2000
+INSERT_CHUNK_CONCURRENCY = 5
+
+# Named write concerns for insert_data; "fast" waits for the primary only and skips the journal,
+# which suits append-only security events. w=0 (no acknowledgement) is deliberately not offered.
+WRITE_CONCERNS = {
+    "fast": pymongo.WriteConcern(w=1, j=False),
+}
+
+# Indexes create_collection sets up when the caller passes none, keyed by collection name
+DEFAULT_INDEXES: Dict[str, List[IndexModel]] = {
+    "security_events": [
+        IndexModel([("timestamp", -1)]),
+        IndexModel([("event_type", 1), ("status", 1)]),
+        IndexModel([("source_ip", 1)]),
+    ],
+}
+
+# Server error code for creating a collection that already exists
+NAMESPACE_EXISTS = 48
+
+def _collection_exists_error(error: Exception) -> bool:
+    """
+    Check whether an error from create_collection only means the collection already exists.
+    
+    Args:
+        error: The exception raised by create_collection
+        
+    Returns:
+        bool: True if the collection already exists, False for any other failure
+    """
+    return isinstance(error, pymongo.errors.CollectionInvalid) or (
+        isinstance(error, pymongo.errors.OperationFailure) and error.code == NAMESPACE_EXISTS
+    )
+
+# Documents fetched per round trip when iterating a query cursor
+QUERY_BATCH_SIZE = 1000
+
+def _chunked(data: List[Dict[str, Any]], size: int) -> Iterator[List[InsertOne]]:
+    """
+    Split documents into lists of InsertOne operations of at most size documents.
+    
+    Args:
+        data: The documents to insert
+        size: Maximum number of operations per list
+        
+    Returns:
+        Iterator over the lists of InsertOne operations
+    """
+    iterator = iter(data)
+    while True:
+        ops = [InsertOne(document) for document in itertools.islice(iterator, size)]
+        if not ops:
+            return
+        yield ops
+
+# Keep-alive session for configuration fetches
+_SESSION = requests.Session()
+
+# Seconds a fetched configuration is reused before the configuration API is asked again
+CONFIG_CACHE_TTL = 300.0
+
+# Last fetched configuration: {"configs": dict, "etag": str or None, "fetched_at": monotonic seconds}
+_CONFIG_CACHE: Dict[str, Any] = {}
+
+def _fetch_config() -> Dict[str, Any]:
+    """
+    Fetch the MongoDB configuration from the configuration API, reusing a recent result.
+    
+    Returns:
+        The configuration dictionary; raises if the API cannot be reached or answers with an error
+    """
+    now = time.monotonic()
+    if _CONFIG_CACHE and now - _CONFIG_CACHE['fetched_at'] < CONFIG_CACHE_TTL:
+        return _CONFIG_CACHE['configs']
+    
+    # Revalidate with the ETag of the cached copy, so an unchanged configuration is not sent again
+    headers = {'If-None-Match': _CONFIG_CACHE['etag']} if _CONFIG_CACHE.get('etag') else {}
+    response = _SESSION.get(CONFIG_FACTORY_URL, headers=headers, timeout=5)
+    if response.status_code == 304 and _CONFIG_CACHE:
+        _CONFIG_CACHE['fetched_at'] = now
+        return _CONFIG_CACHE['configs']
+    if response.status_code != 200:
+        raise RuntimeError(f"Failed to fetch configuration from API: {response.status_code}")
+    
+    configs = response.json().get('configs')
+    _CONFIG_CACHE.update(configs=configs, etag=response.headers.get('ETag'), fetched_at=now)
+    return configs
+
 class MongoDBHandler:
     """
     A class to handle MongoDB operations including connecting to the database,
     creating collections, inserting data, and querying data.
     """
-    _instance = None
+    # One instance per process: a MongoClient must not be shared across fork()
+    _instances: Dict[int, "MongoDBHandler"] = {}
+    _init_lock = threading.Lock()
     
-    def __new__(cls):
+    def __new__(cls, *args, **kwargs):
         """
-        Create a singleton instance of the factory
+        Create a singleton instance of the handler for the current process
         
         """
-        if cls._instance is None:
-            cls._instance = super(MongoDBHandler, cls).__new__(cls)
-            cls._instance._initialized = False
-        return cls._instance
+        pid = os.getpid()
+        instance = cls._instances.get(pid)
+        if instance is None:
+            with cls._init_lock:
+                instance = cls._instances.get(pid)
+                if instance is None:
+                    instance = super(MongoDBHandler, cls).__new__(cls)
+                    instance._initialized = False
+                    cls._instances[pid] = instance
+        return instance
+    
+    @classmethod
+    def _reset(cls) -> None:
+        """
+        Forget the instances inherited from the parent process, called in a forked child
+        """
+        cls._instances.clear()
+        # The lock may have been held by another parent thread at fork time
+        cls._init_lock = threading.Lock()
     
     def __init__(self, db_name: str = "gae252_siem"):
         """
@@ -31,81 +159,101 @@ class MongoDBHandler:
             connection_string: MongoDB connection string
             db_name: Name of the database to connect to
         """
-        # Only initialize once
+        # Only initialize once; concurrent first calls wait for the one connecting to MongoDB
         if self._initialized:
             return
-        try:
-            # Fetch configuration from HTTP endpoint
-            response = requests.get(CONFIG_FACTORY_URL, timeout=5)
-            if response.status_code == 200:
-                self.config = response.json().get('configs')
+        with self._init_lock:
+            if self._initialized:
+                return
+            try:
+                # Fetch configuration from HTTP endpoint
+                self.config = _fetch_config()
                 print(f"- INFO - util_mongodb.py MongoDBHandler.__init__() - Configuration loaded from API: {CONFIG_FACTORY_URL}")
+                connection_string = self.config.get('Mongodb', {}).get('connection_string', '')
+                self.client = pymongo.MongoClient(
+                    connection_string,
+                    maxPoolSize=MONGO_MAX_POOL_SIZE,
+                    minPoolSize=MONGO_MIN_POOL_SIZE,
+                    compressors=MONGO_COMPRESSORS,
+                    zlibCompressionLevel=MONGO_ZLIB_LEVEL,
+                    serverSelectionTimeoutMS=5000,
+                    retryWrites=True
+                )
+                self.db = self.client[db_name]
+                self.client.server_info()
+                # Only a fully connected handler counts as initialized; a failed attempt is retried by the next caller
+                self._initialized = True
+                print(f"- INFO - util_mongodb.py MongoDBHandler.__init__() - Successfully connected to MongoDB: {db_name}")
                 
-            else:
-                print(f"- ERROR - util_mongodb.py MongoDBHandler.__init__() - Failed to fetch configuration from API: {response.status_code}")
-            connection_string = self.config.get('Mongodb', '').get('connection_string', '')
-            self.client = pymongo.MongoClient(connection_string)
-            self.db = self.client[db_name]
-            self.client.server_info()
-            print(f"- INFO - util_mongodb.py MongoDBHandler.__init__() - Successfully connected to MongoDB: {db_name}")
-            
-        except pymongo.errors.ServerSelectionTimeoutError as e:
-            print(f"- ERROR - util_mongodb.py MongoDBHandler.__init__() - Failed to connect to MongoDB: {e}")
-            raise
-        except Exception as e:
-            print(f"- ERROR - util_mongodb.py MongoDBHandler.__init__() - An error occurred while connecting to MongoDB: {e}")
-            raise
-        except Exception as e:
-            print(f"- ERROR - util_mongodb.py MongoDBHandler.__init__() - Error occurred while initialization: {e}")
-            raise
-        finally:
-            self._initialized = True
+            except pymongo.errors.ServerSelectionTimeoutError as e:
+                print(f"- ERROR - util_mongodb.py MongoDBHandler.__init__() - Failed to connect to MongoDB: {e}")
+                raise
+            except Exception as e:
+                print(f"- ERROR - util_mongodb.py MongoDBHandler.__init__() - An error occurred while connecting to MongoDB: {e}")
+                raise
     
-    def create_collection(self, collection_name: str) -> bool:
+    def create_collection(self, collection_name: str, indexes: Optional[List[IndexModel]] = None) -> bool:
         """
         Create a new collection in the database if it doesn't exist.
         
         Args:
             collection_name: Name of the collection to create
+            indexes: Indexes to ensure on the collection; defaults to DEFAULT_INDEXES for known collections
             
         Returns:
             bool: True if collection was created or already exists, False otherwise
         """
         try:
-            # Check if collection already exists
-            if collection_name in self.db.list_collection_names():
-                print(f"- INFO - util_mongodb.py MongoDBHandler.create_collection() - Collection '{collection_name}' already exists")
-                return True
-            
-            # Create collection
-            self.db.create_collection(collection_name)
+            # Create collection in one round trip; the server rejects it if the collection already exists
+            self.db.create_collection(collection_name, check_exists=False)
             print(f"- INFO - util_mongodb.py MongoDBHandler.create_collection() - Collection '{collection_name}' created successfully")
-            return True
         except Exception as e:
-            print(f"- ERROR - util_mongodb.py MongoDBHandler.create_collection() - Failed to create collection '{collection_name}': {e}")
-            return False
+            if not _collection_exists_error(e):
+                print(f"- ERROR - util_mongodb.py MongoDBHandler.create_collection() - Failed to create collection '{collection_name}': {e}")
+                return False
+            logger.debug("- DEBUG - util_mongodb.py MongoDBHandler.create_collection() - Collection '%s' already exists", collection_name)
+        
+        # Index creation is idempotent, so existing collections get missing indexes as well
+        indexes = DEFAULT_INDEXES.get(collection_name) if indexes is None else indexes
+        if indexes:
+            try:
+                self.db[collection_name].create_indexes(indexes)
+            except Exception as e:
+                print(f"- ERROR - util_mongodb.py MongoDBHandler.create_collection() - Failed to create indexes on '{collection_name}': {e}")
+                return False
+        return True
     
-    def insert_data(self, collection_name: str, data: Union[Dict[str, Any], List[Dict[str, Any]]]) -> bool:
+    def insert_data(self, collection_name: str, data: Union[Dict[str, Any], List[Dict[str, Any]]],
+                    write_concern: str = "default") -> bool:
         """
         Insert one or multiple documents into a specified collection.
         
         Args:
             collection_name: Name of the collection to insert data into
             data: A dictionary or list of dictionaries representing the document(s) to insert
+            write_concern: "default" to use the client's write concern, or a name from WRITE_CONCERNS
             
         Returns:
             bool: True if insertion was successful, False otherwise
         """
         try:
             collection = self.db[collection_name]
+            if write_concern != "default":
+                collection = collection.with_options(write_concern=WRITE_CONCERNS[write_concern])
             
             # Handle single document or multiple documents
             if isinstance(data, dict):
                 result = collection.insert_one(data)
-                print(f"- INFO - util_mongodb.py MongoDBHandler.insert_data() - Document inserted with ID: {result.inserted_id}")
+                logger.debug("- DEBUG - util_mongodb.py MongoDBHandler.insert_data() - Document inserted with ID: %s", result.inserted_id)
+            elif isinstance(data, list) and len(data) > INSERT_CHUNK_THRESHOLD:
+                # Large lists go out in moderate unordered batches instead of one oversized request
+                inserted = 0
+                for ops in _chunked(data, INSERT_CHUNK_SIZE):
+                    inserted += collection.bulk_write(ops, ordered=False).inserted_count
+                logger.debug("- DEBUG - util_mongodb.py MongoDBHandler.insert_data() - Inserted %s documents", inserted)
             elif isinstance(data, list):
                 result = collection.insert_many(data)
-                print(f"- INFO - util_mongodb.py MongoDBHandler.insert_data() - Inserted {len(result.inserted_ids)} documents")
+                logger.debug("- DEBUG - util_mongodb.py MongoDBHandler.insert_data() - Inserted %s documents", len(result.inserted_ids))
             else:
                 print(f"- ERROR - util_mongodb.py MongoDBHandler.insert_data() - Data must be a dictionary or a list of dictionaries")
                 return False
@@ -115,9 +263,115 @@ class MongoDBHandler:
             print(f"- ERROR - util_mongodb.py MongoDBHandler.insert_data() - Failed to insert data into '{collection_name}': {e}")
             return False
     
-    def query_data(self, collection_name: str, query: Dict[str, Any] = None, 
+    def bulk_write(self, collection_name: str, ops: List[Union[InsertOne, UpdateOne, DeleteOne]],
+                   ordered: bool = False) -> Optional[BulkWriteResult]:
+        """
+        Send a mix of write operations to a collection in a single round trip.
+        
+        Args:
+            collection_name: Name of the collection to write to
+            ops: List of pymongo write models (InsertOne, UpdateOne, DeleteOne, ...)
+            ordered: If True, stop at the first failing operation
+            
+        Returns:
+            The BulkWriteResult, or None if the write failed
+        """
+        try:
+            result = self.db[collection_name].bulk_write(ops, ordered=ordered)
+            logger.debug("- DEBUG - util_mongodb.py MongoDBHandler.bulk_write() - Inserted %s, upserted %s, modified %s, deleted %s documents in '%s'", result.inserted_count, result.upserted_count, result.modified_count, result.deleted_count, collection_name)
+            return result
+        except Exception as e:
+            print(f"- ERROR - util_mongodb.py MongoDBHandler.bulk_write() - Failed to write to '{collection_name}': {e}")
+            return None
+    
+    def bulk_load(self, collection_name: str, data: List[Dict[str, Any]], recreate_indexes: bool = True) -> bool:
+        """
+        Load a large batch of documents with secondary indexes dropped during the load.
+        
+        Intended for seeding or reloading a collection: the secondary indexes are rebuilt once at the
+        end instead of being maintained per document. Unique constraints are not enforced during the
+        load, so a duplicate makes the rebuild of that index fail.
+        
+        Args:
+            collection_name: Name of the collection to load data into
+            data: A list of dictionaries representing the documents to insert
+            recreate_indexes: If True, rebuild the dropped indexes after the load
+            
+        Returns:
+            bool: True if the load and the index rebuild were successful, False otherwise
+        """
+        collection = self.db[collection_name]
+        indexes = []
+        success = True
+        try:
+            # Remember every index except the mandatory _id index so it can be rebuilt with the same options
+            for name, spec in collection.index_information().items():
+                if name == '_id_':
+                    continue
+                options = {k: v for k, v in spec.items() if k not in ('key', 'v', 'ns')}
+                indexes.append(IndexModel(spec['key'], name=name, **options))
+            collection.drop_indexes()
+            
+            inserted = 0
+            for ops in _chunked(data, INSERT_CHUNK_SIZE):
+                inserted += collection.bulk_write(ops, ordered=False).inserted_count
+            print(f"- INFO - util_mongodb.py MongoDBHandler.bulk_load() - Loaded {inserted} documents into '{collection_name}'")
+        except Exception as e:
+            print(f"- ERROR - util_mongodb.py MongoDBHandler.bulk_load() - Failed to load data into '{collection_name}': {e}")
+            success = False
+        
+        # Rebuild the indexes even after a failed load, so the collection is not left without them
+        if recreate_indexes and indexes:
+            try:
+                collection.create_indexes(indexes)
+                print(f"- INFO - util_mongodb.py MongoDBHandler.bulk_load() - Rebuilt {len(indexes)} indexes on '{collection_name}'")
+            except Exception as e:
+                print(f"- ERROR - util_mongodb.py MongoDBHandler.bulk_load() - Failed to rebuild indexes on '{collection_name}': {e}")
+                success = False
+        return success
+    
+    def query_data_stream(self, collection_name: str, query: Dict[str, Any] = None,
+                          projection: Dict[str, Any] = None, limit: int = 0,
+                          sort: List[tuple] = None, hint: List[tuple] = None,
+                          batch_size: int = QUERY_BATCH_SIZE) -> Iterator[Dict[str, Any]]:
+        """
+        Stream documents from a specified collection without loading the whole result set.
+        
+        Args:
+            collection_name: Name of the collection to query
+            query: Dictionary specifying the query criteria
+            projection: Dictionary specifying the fields to include/exclude
+            limit: Maximum number of documents to return (0 for no limit)
+            sort: List of (key, direction) pairs for sort order
+            hint: Index specification as (key, direction) pairs the server should use
+            batch_size: Number of documents fetched from the server per round trip
+            
+        Returns:
+            Iterator over the documents matching the query criteria; errors are raised while iterating
+        """
+        collection = self.db[collection_name]
+        
+        # Execute query with optional parameters
+        cursor = collection.find(query or {}, projection)
+        
+        # Apply sort if provided
+        if sort:
+            cursor = cursor.sort(sort)
+        
+        # Force the given index if provided
+        if hint:
+            cursor = cursor.hint(hint)
+            
+        # Apply limit if provided, and never fetch more documents per batch than the limit
+        if limit > 0:
+            cursor = cursor.limit(limit)
+            batch_size = min(batch_size, limit)
+        
+        yield from cursor.batch_size(batch_size)
+    
+    def query_data(self, collection_name: str, query: Dict[str, Any] = None,
                    projection: Dict[str, Any] = None, limit: int = 0,
-                   sort: List[tuple] = None) -> List[Dict[str, Any]]:
+                   sort: List[tuple] = None, hint: List[tuple] = None) -> List[Dict[str, Any]]:
         """
         Query documents from a specified collection.
         
@@ -127,31 +381,14 @@ class MongoDBHandler:
             projection: Dictionary specifying the fields to include/exclude
             limit: Maximum number of documents to return (0 for no limit)
             sort: List of (key, direction) pairs for sort order
+            hint: Index specification as (key, direction) pairs the server should use
             
         Returns:
             List of documents matching the query criteria
         """
         try:
-            collection = self.db[collection_name]
-            
-            # Default to empty query if None provided
-            if query is None:
-                query = {}
-                
-            # Execute query with optional parameters
-            cursor = collection.find(query, projection)
-            
-            # Apply sort if provided
-            if sort:
-                cursor = cursor.sort(sort)
-                
-            # Apply limit if provided
-            if limit > 0:
-                cursor = cursor.limit(limit)
-                
-            # Convert cursor to list
-            result = list(cursor)
-            print(f"- INFO - util_mongodb.py MongoDBHandler.query_data() - Query returned {len(result)} documents from '{collection_name}'")
+            result = list(self.query_data_stream(collection_name, query, projection, limit, sort, hint))
+            logger.debug("- DEBUG - util_mongodb.py MongoDBHandler.query_data() - Query returned %s documents from '%s'", len(result), collection_name)
             return result
         except Exception as e:
             print(f"- ERROR - util_mongodb.py MongoDBHandler.query_data() - Failed to query data from '{collection_name}': {e}")
@@ -179,12 +416,58 @@ class MongoDBHandler:
                 update_data = {'$set': update_data}
             
             result = collection.update_many(query, update_data, upsert=upsert)
-            print(f"- INFO - util_mongodb.py MongoDBHandler.update_data() - Updated {result.modified_count} documents in '{collection_name}'")
+            logger.debug("- DEBUG - util_mongodb.py MongoDBHandler.update_data() - Updated %s documents in '%s'", result.modified_count, collection_name)
             return True
         except Exception as e:
             print(f"- ERROR - util_mongodb.py MongoDBHandler.update_data() - Failed to update data in '{collection_name}': {e}")
             return False
     
+    def find_one_and_update(self, collection_name: str, query: Dict[str, Any],
+                            update_data: Dict[str, Any], upsert: bool = False,
+                            projection: Dict[str, Any] = None) -> Optional[Dict[str, Any]]:
+        """
+        Atomically update a single document and return it after the update.
+        
+        Args:
+            collection_name: Name of the collection to update
+            query: Dictionary specifying which document to update
+            update_data: Dictionary specifying the update operations
+            upsert: If True, create a new document when no document matches the query
+            projection: Dictionary specifying the fields to include/exclude in the returned document
+            
+        Returns:
+            The updated document, or None if no document matched or the update failed
+        """
+        try:
+            collection = self.db[collection_name]
+            return collection.find_one_and_update(
+                query, update_data, projection=projection, upsert=upsert,
+                return_document=pymongo.ReturnDocument.AFTER
+            )
+        except Exception as e:
+            print(f"- ERROR - util_mongodb.py MongoDBHandler.find_one_and_update() - Failed to update document in '{collection_name}': {e}")
+            return None
+    
+    def create_index(self, collection_name: str, keys: List[tuple], **kwargs) -> bool:
+        """
+        Create an index on a collection if it doesn't exist.
+        
+        Args:
+            collection_name: Name of the collection to index
+            keys: List of (key, direction) pairs
+            **kwargs: Index options passed to pymongo (e.g. unique=True, name=...)
+            
+        Returns:
+            bool: True if the index exists or was created, False otherwise
+        """
+        try:
+            name = self.db[collection_name].create_index(keys, **kwargs)
+            print(f"- INFO - util_mongodb.py MongoDBHandler.create_index() - Index '{name}' ready on '{collection_name}'")
+            return True
+        except Exception as e:
+            print(f"- ERROR - util_mongodb.py MongoDBHandler.create_index() - Failed to create index on '{collection_name}': {e}")
+            return False
+    
     def delete_data(self, collection_name: str, query: Dict[str, Any]) -> bool:
         """
         Delete documents from a specified collection.
@@ -199,7 +482,7 @@ class MongoDBHandler:
         try:
             collection = self.db[collection_name]
             result = collection.delete_many(query)
-            print(f"- INFO - util_mongodb.py MongoDBHandler.delete_data() - Deleted {result.deleted_count} documents from '{collection_name}'")
+            logger.debug("- DEBUG - util_mongodb.py MongoDBHandler.delete_data() - Deleted %s documents from '%s'", result.deleted_count, collection_name)
             return True
         except Exception as e:
             print(f"- ERROR - util_mongodb.py MongoDBHandler.delete_data() - Failed to delete data from '{collection_name}': {e}")
@@ -215,16 +498,251 @@ class MongoDBHandler:
         except Exception as e:
             print(f"- ERROR - util_mongodb.py MongoDBHandler.close_connection() - Error closing MongoDB connection: {e}")
 
-def main():
+# A forked child builds its own client instead of reusing the parent's sockets
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=MongoDBHandler._reset)
+
+class AsyncMongoDBHandler:
+    """
+    Asyncio counterpart of MongoDBHandler built on PyMongo's native AsyncMongoClient.
+    Operations are awaited on the event loop instead of blocking it or occupying a worker thread.
+    """
+    _instance = None
+    _init_lock = threading.Lock()
+    
+    def __new__(cls, *args, **kwargs):
+        """
+        Create a singleton instance of the handler
+        """
+        if cls._instance is None:
+            with cls._init_lock:
+                if cls._instance is None:
+                    cls._instance = super(AsyncMongoDBHandler, cls).__new__(cls)
+                    cls._instance._initialized = False
+        return cls._instance
+    
+    def __init__(self, db_name: str = "gae252_siem"):
+        """
+        Initialize the async MongoDB handler; the connection is opened lazily by the driver.
+        
+        Args:
+            db_name: Name of the database to connect to
+        """
+        # Only initialize once
+        if self._initialized:
+            return
+        with self._init_lock:
+            if self._initialized:
+                return
+            try:
+                self.config = _fetch_config()
+                print(f"- INFO - util_mongodb.py AsyncMongoDBHandler.__init__() - Configuration loaded from API: {CONFIG_FACTORY_URL}")
+                connection_string = self.config.get('Mongodb', {}).get('connection_string', '')
+                self.client = pymongo.AsyncMongoClient(
+                    connection_string,
+                    maxPoolSize=MONGO_MAX_POOL_SIZE,
+                    minPoolSize=MONGO_MIN_POOL_SIZE,
+                    compressors=MONGO_COMPRESSORS,
+                    zlibCompressionLevel=MONGO_ZLIB_LEVEL
+                )
+                self.db = self.client[db_name]
+                # Collections known to exist, so create_collection skips the round trip after the first call
+                self._known_collections = set()
+                self._initialized = True
+            except Exception as e:
+                print(f"- ERROR - util_mongodb.py AsyncMongoDBHandler.__init__() - Error occurred while initialization: {e}")
+                raise
+    
+    async def connect(self) -> None:
+        """
+        Verify the connection to the server.
+        """
+        await self.client.admin.command('ping')
+        print(f"- INFO - util_mongodb.py AsyncMongoDBHandler.connect() - Successfully connected to MongoDB: {self.db.name}")
+    
+    async def create_collection(self, collection_name: str, indexes: Optional[List[IndexModel]] = None) -> bool:
+        """
+        Create a new collection in the database if it doesn't exist.
+        
+        Args:
+            collection_name: Name of the collection to create
+            indexes: Indexes to ensure on the collection; defaults to DEFAULT_INDEXES for known collections
+            
+        Returns:
+            bool: True if collection was created or already exists, False otherwise
+        """
+        if collection_name in self._known_collections:
+            return True
+        try:
+            # Create collection in one round trip; the server rejects it if the collection already exists
+            await self.db.create_collection(collection_name, check_exists=False)
+            print(f"- INFO - util_mongodb.py AsyncMongoDBHandler.create_collection() - Collection '{collection_name}' created successfully")
+        except Exception as e:
+            if not _collection_exists_error(e):
+                print(f"- ERROR - util_mongodb.py AsyncMongoDBHandler.create_collection() - Failed to create collection '{collection_name}': {e}")
+                return False
+        
+        # Index creation is idempotent, so existing collections get missing indexes as well
+        indexes = DEFAULT_INDEXES.get(collection_name) if indexes is None else indexes
+        if indexes:
+            try:
+                await self.db[collection_name].create_indexes(indexes)
+            except Exception as e:
+                print(f"- ERROR - util_mongodb.py AsyncMongoDBHandler.create_collection() - Failed to create indexes on '{collection_name}': {e}")
+                return False
+        self._known_collections.add(collection_name)
+        return True
+    
+    async def insert_data(self, collection_name: str, data: Union[Dict[str, Any], List[Dict[str, Any]]],
+                          ordered: bool = True, write_concern: str = "default") -> bool:
+        """
+        Insert one or multiple documents into a specified collection.
+        
+        Args:
+            collection_name: Name of the collection to insert data into
+            data: A dictionary or list of dictionaries representing the document(s) to insert
+            ordered: If False, the server keeps inserting the remaining documents after a failure
+            write_concern: "default" to use the client's write concern, or a name from WRITE_CONCERNS
+            
+        Returns:
+            bool: True if insertion was successful, False otherwise
+        """
+        try:
+            collection = self.db[collection_name]
+            if write_concern != "default":
+                collection = collection.with_options(write_concern=WRITE_CONCERNS[write_concern])
+            if isinstance(data, dict):
+                await collection.insert_one(data)
+            elif isinstance(data, list) and len(data) > INSERT_CHUNK_THRESHOLD and not ordered:
+                # Large unordered lists go out as moderate batches, several of them in flight at once
+                semaphore = asyncio.Semaphore(INSERT_CHUNK_CONCURRENCY)
+                
+                async def _write(ops: List[InsertOne]) -> int:
+                    async with semaphore:
+                        return (await collection.bulk_write(ops, ordered=False)).inserted_count
+                
+                counts = await asyncio.gather(*(_write(ops) for ops in _chunked(data, INSERT_CHUNK_SIZE)))
+                logger.debug("- DEBUG - util_mongodb.py AsyncMongoDBHandler.insert_data() - Inserted %s documents into '%s'", sum(counts), collection_name)
+            elif isinstance(data, list):
+                if data:
+                    result = await collection.insert_many(data, ordered=ordered)
+                    logger.debug("- DEBUG - util_mongodb.py AsyncMongoDBHandler.insert_data() - Inserted %s documents into '%s'", len(result.inserted_ids), collection_name)
+            else:
+                print(f"- ERROR - util_mongodb.py AsyncMongoDBHandler.insert_data() - Data must be a dictionary or a list of dictionaries")
+                return False
+            return True
+        except Exception as e:
+            print(f"- ERROR - util_mongodb.py AsyncMongoDBHandler.insert_data() - Failed to insert data into '{collection_name}': {e}")
+            return False
+    
+    async def bulk_write(self, collection_name: str, ops: List[Union[InsertOne, UpdateOne, DeleteOne]],
+                         ordered: bool = False) -> Optional[BulkWriteResult]:
+        """
+        Send a mix of write operations to a collection in a single round trip.
+        
+        Args:
+            collection_name: Name of the collection to write to
+            ops: List of pymongo write models (InsertOne, UpdateOne, DeleteOne, ...)
+            ordered: If True, stop at the first failing operation
+            
+        Returns:
+            The BulkWriteResult, or None if the write failed
+        """
+        try:
+            return await self.db[collection_name].bulk_write(ops, ordered=ordered)
+        except Exception as e:
+            print(f"- ERROR - util_mongodb.py AsyncMongoDBHandler.bulk_write() - Failed to write to '{collection_name}': {e}")
+            return None
+    
+    async def query_data(self, collection_name: str, query: Dict[str, Any] = None,
+                         projection: Dict[str, Any] = None, limit: int = 0,
+                         sort: List[tuple] = None) -> List[Dict[str, Any]]:
+        """
+        Query documents from a specified collection.
+        
+        Args:
+            collection_name: Name of the collection to query
+            query: Dictionary specifying the query criteria
+            projection: Dictionary specifying the fields to include/exclude
+            limit: Maximum number of documents to return (0 for no limit)
+            sort: List of (key, direction) pairs for sort order
+            
+        Returns:
+            List of documents matching the query criteria
+        """
+        try:
+            cursor = self.db[collection_name].find(query or {}, projection)
+            if sort:
+                cursor = cursor.sort(sort)
+            if limit > 0:
+                cursor = cursor.limit(limit)
+            return await cursor.to_list(length=limit or None)
+        except Exception as e:
+            print(f"- ERROR - util_mongodb.py AsyncMongoDBHandler.query_data() - Failed to query data from '{collection_name}': {e}")
+            return []
+    
+    async def update_data(self, collection_name: str, query: Dict[str, Any],
+                          update_data: Dict[str, Any], upsert: bool = False) -> bool:
+        """
+        Update documents in a specified collection.
+        
+        Args:
+            collection_name: Name of the collection to update
+            query: Dictionary specifying which documents to update
+            update_data: Dictionary specifying the update operations
+            upsert: If True, create a new document when no document matches the query
+            
+        Returns:
+            bool: True if update was successful, False otherwise
+        """
+        try:
+            # Ensure update_data has proper operator
+            if not any(key.startswith('$') for key in update_data.keys()):
+                update_data = {'$set': update_data}
+            await self.db[collection_name].update_many(query, update_data, upsert=upsert)
+            return True
+        except Exception as e:
+            print(f"- ERROR - util_mongodb.py AsyncMongoDBHandler.update_data() - Failed to update data in '{collection_name}': {e}")
+            return False
+    
+    async def delete_data(self, collection_name: str, query: Dict[str, Any]) -> bool:
+        """
+        Delete documents from a specified collection.
+        
+        Args:
+            collection_name: Name of the collection to delete from
+            query: Dictionary specifying which documents to delete
+            
+        Returns:
+            bool: True if deletion was successful, False otherwise
+        """
+        try:
+            await self.db[collection_name].delete_many(query)
+            return True
+        except Exception as e:
+            print(f"- ERROR - util_mongodb.py AsyncMongoDBHandler.delete_data() - Failed to delete data from '{collection_name}': {e}")
+            return False
+    
+    async def close_connection(self) -> None:
+        """
+        Close the MongoDB connection.
+        """
+        try:
+            await self.client.close()
+            print(f"- INFO - util_mongodb.py AsyncMongoDBHandler.close_connection() - MongoDB connection closed")
+        except Exception as e:
+            print(f"- ERROR - util_mongodb.py AsyncMongoDBHandler.close_connection() - Error closing MongoDB connection: {e}")
+
+async def main():
     """
-    Main function demonstrating MongoDB operations.
+    Main function demonstrating MongoDB operations; independent operations run concurrently.
     """
     # Create a MongoDB handler instance
-    mongo_handler = MongoDBHandler()
+    mongo_handler = AsyncMongoDBHandler()
     
     # Example 1: Create a collection
     collection_name = "security_events"
-    mongo_handler.create_collection(collection_name)
+    await mongo_handler.create_collection(collection_name)
     
     # Example 2: Insert a single document
     event_data = {
@@ -239,7 +757,6 @@ def main():
             "location": "Unknown"
         }
     }
-    mongo_handler.insert_data(collection_name, event_data)
     
     # Example 3: Insert multiple documents
     events_data = [
@@ -267,46 +784,50 @@ def main():
             }
         }
     ]
-    mongo_handler.insert_data(collection_name, events_data)
-    
-    # Example 4: Query all documents in a collection
-    all_events = mongo_handler.query_data(collection_name)
-    print(f"main() - All events: {len(all_events)}")
     
-    # Example 5: Query with specific criteria
-    failed_logins = mongo_handler.query_data(
-        collection_name, 
-        query={"event_type": "login_attempt", "status": "failed"}
+    # The two inserts are independent of each other
+    await asyncio.gather(
+        mongo_handler.insert_data(collection_name, event_data),
+        mongo_handler.insert_data(collection_name, events_data)
     )
-    print(f"main() - Failed login attempts: {len(failed_logins)}")
     
-    # Example 6: Query with projection (include only specific fields)
-    login_sources = mongo_handler.query_data(
-        collection_name,
-        query={"event_type": "login_attempt"},
-        projection={"source_ip": 1, "status": 1, "_id": 0}
+    # Examples 4-6 only read, so they run concurrently:
+    # all documents, failed logins (specific criteria) and login sources (projection)
+    all_events, failed_logins, login_sources = await asyncio.gather(
+        mongo_handler.query_data(collection_name),
+        mongo_handler.query_data(
+            collection_name, 
+            query={"event_type": "login_attempt", "status": "failed"}
+        ),
+        mongo_handler.query_data(
+            collection_name,
+            query={"event_type": "login_attempt"},
+            projection={"source_ip": 1, "status": 1, "_id": 0}
+        )
     )
+    print(f"main() - All events: {len(all_events)}")
+    print(f"main() - Failed login attempts: {len(failed_logins)}")
     print("main() - Login sources:")
     for login in login_sources:
         print(f"  main() - Source IP: {login['source_ip']}, Status: {login['status']}")
     
-    # Example 7: Update data
-    mongo_handler.update_data(
+    # Example 7: Update data (after the reads, which should see the original status)
+    await mongo_handler.update_data(
         collection_name,
         query={"user": "admin"},
         update_data={"$set": {"status": "investigated"}}
     )
     
     # Example 8: Delete data
-    # mongo_handler.delete_data(
+    # await mongo_handler.delete_data(
     #     collection_name,
     #     query={"event_type": "file_access"}
     # )
     
     # Close connection when done
-    mongo_handler.close_connection()
+    await mongo_handler.close_connection()
 
 if __name__ == "__main__":
     # You need to install pymongo first:
     # pip install pymongo
-    main()
\ No newline at end of file
+    asyncio.run(main())
\ No newline at end of file
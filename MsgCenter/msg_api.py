@@ -1,16 +1,60 @@
-from fastapi import FastAPI, HTTPException, status
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, HTTPException, Request, Response, status
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel
-from typing import Dict, Any
+from typing import Dict, Any, Tuple
+import asyncio
 import configparser
+import hashlib
+import orjson
 import os
+import re
+import threading
+import time
+
+# watchfiles is optional; without it the cache falls back to checking the file mtime per request
+try:
+    import watchfiles
+except ImportError:
+    watchfiles = None
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    FastAPI lifespan event handler for startup and shutdown.
+    
+    Parses all configuration files once at startup and, if watchfiles is installed,
+    keeps them current by reloading a file only when it changes on disk.
+    """
+    global _WATCHING
+    _preload_configs()
+    watcher = None
+    if watchfiles is not None:
+        watcher = asyncio.create_task(_watch_configs())
+        watcher.add_done_callback(_watcher_stopped)
+        _WATCHING = True
+        print(f"- INFO - msg_api.py lifespan() - Watching configuration directory: {CONFIG_DIR}")
+    
+    yield
+    
+    _WATCHING = False
+    if watcher is not None:
+        watcher.cancel()
+        try:
+            await watcher
+        except asyncio.CancelledError:
+            pass
 
 # Create FastAPI app
 app = FastAPI(
     title="Message Center API",
     description="API for accessing configuration information for the AI SIEM system",
     version="1.0.0",
-    docs_url=None
+    docs_url=None,
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan
 )
 
 # Add CORS middleware to allow cross-origin requests
@@ -20,7 +64,10 @@ app.add_middleware(
                    "http://localhost:10002", "http://rpa:10002"],
     allow_credentials=True,
     allow_methods=["GET"],
-    allow_headers=["*"], 
+    # Only the headers clients send; a wildcard makes every preflight echo the requested headers back
+    allow_headers=["Content-Type", "If-None-Match"],
+    expose_headers=["ETag"],
+    max_age=86400,  # Browsers may reuse a preflight result for a day
 )
 
 # Define paths to configuration files
@@ -31,6 +78,32 @@ CONFIG_FACTORY_PATH = os.path.join(CONFIG_DIR, "config_factory.ini")
 CONFIG_MONGODB_PATH = os.path.join(CONFIG_DIR, "config_mongodb.ini")
 CONFIG_RAP_PATH = os.path.join(CONFIG_DIR, "config_rpa.ini")
 
+# Seconds a parsed configuration file is served from memory; a changed mtime reloads it earlier
+CONFIG_CACHE_TTL = 60
+
+# File name reported in the response body of each configuration file
+_CONFIG_FILENAMES = {
+    CONFIG_EMBED_PATH: "config_embed.ini",
+    CONFIG_FACTORY_PATH: "config_factory.ini",
+    CONFIG_MONGODB_PATH: "config_mongodb.ini",
+    CONFIG_RAP_PATH: "config_rap.ini",
+}
+
+# Parsed configuration files: path -> (mtime_ns, loaded_at, configs, etag, serialized response body)
+_CONFIG_CACHE: Dict[str, Tuple[int, float, Dict[str, Dict[str, Any]], str, bytes]] = {}
+# Serializes cache updates coming from worker threads; readers need no lock
+_CONFIG_CACHE_LOCK = threading.Lock()
+
+# Configuration files served by the API, keyed by absolute path as reported by the file watcher
+_CONFIG_PATHS = {os.path.abspath(path): path for path in
+                 (CONFIG_EMBED_PATH, CONFIG_FACTORY_PATH, CONFIG_MONGODB_PATH, CONFIG_RAP_PATH)}
+
+# "key = value" or "key: value" line, split at the first delimiter like configparser does
+_OPTION_RE = re.compile(r'(.*?)\s*[=:]\s*(.*)$')
+
+# True while the file watcher keeps _CONFIG_CACHE current; cached entries are then served without a stat
+_WATCHING = False
+
 # Pydantic models for response schemas
 class ConfigResponse(BaseModel):
     """Response model for configuration data"""
@@ -82,12 +155,191 @@ def _config_to_dict(config: configparser.ConfigParser) -> Dict[str, Dict[str, An
     Returns:
         Dictionary representation of the configuration
     """
-    result = {}
-    for section in config.sections():
-        result[section] = {}
-        for key, value in config[section].items():
-            result[section][key] = value
-    return result
+    # dict() of a section proxy yields interpolated values including DEFAULT keys, like items()
+    return {section: dict(config[section]) for section in config.sections()}
+
+def _parse_config(config_path: str) -> Dict[str, Dict[str, Any]]:
+    """
+    Parse an INI file into a dictionary in a single pass over its lines
+    
+    Produces the same result as _config_to_dict(_load_config(config_path)) for the plain
+    "key = value" files written by _save_config; files using interpolation, continuation
+    lines or anything else the single pass does not handle are parsed with configparser
+    
+    Args:
+        config_path: Path to the configuration file
+        
+    Returns:
+        Dictionary representation of the configuration
+        
+    Raises:
+        FileNotFoundError: If the configuration file doesn't exist
+        configparser.Error: If there's an error parsing the configuration file
+    """
+    if not os.path.exists(config_path):
+        raise FileNotFoundError(f"Configuration file not found: {config_path}")
+    
+    defaults: Dict[str, str] = {}
+    sections: Dict[str, Dict[str, str]] = {}
+    current = None
+    with open(config_path) as config_file:
+        for line in config_file:
+            stripped = line.strip()
+            if not stripped or stripped[0] in "#;":
+                continue
+            if line[0].isspace() or "%" in stripped:
+                # Continuation lines and interpolation are left to configparser
+                return _config_to_dict(_load_config(config_path))
+            if stripped[0] == "[":
+                name = stripped[1:-1]
+                if stripped[-1] != "]" or not name or name in sections:
+                    # Unusual or duplicate header: let configparser decide
+                    return _config_to_dict(_load_config(config_path))
+                current = defaults if name == configparser.DEFAULTSECT else sections.setdefault(name, {})
+                continue
+            match = _OPTION_RE.match(stripped)
+            if current is None or match is None or not match.group(1) or match.group(1).lower() in current:
+                # Missing section header, malformed or duplicate option: let configparser report it
+                return _config_to_dict(_load_config(config_path))
+            # Option names are lower-cased, as by ConfigParser.optionxform
+            current[match.group(1).lower()] = match.group(2)
+    
+    # Every section also carries the DEFAULT options it does not override, listed after its own
+    return {
+        section: options | {key: value for key, value in defaults.items() if key not in options}
+        for section, options in sections.items()
+    }
+
+def _load_config_cached(config_path: str) -> Tuple[Dict[str, Dict[str, Any]], str, bytes]:
+    """
+    Load configuration from an INI file as a dictionary, reusing the parsed result while the file is unchanged
+    
+    Args:
+        config_path: Path to the configuration file
+        
+    Returns:
+        Tuple of the configuration dictionary, its ETag and the serialized response body;
+        the dictionary is shared and must not be modified
+        
+    Raises:
+        FileNotFoundError: If the configuration file doesn't exist
+        configparser.Error: If there's an error parsing the configuration file
+    """
+    cached = _CONFIG_CACHE.get(config_path)
+    if _WATCHING and cached is not None:
+        return cached[2:]
+    
+    try:
+        # Nanosecond mtime, so two writes within the same second are still told apart
+        mtime = os.stat(config_path).st_mtime_ns
+    except FileNotFoundError:
+        raise FileNotFoundError(f"Configuration file not found: {config_path}")
+    
+    now = time.monotonic()
+    if cached is not None and cached[0] == mtime and now - cached[1] < CONFIG_CACHE_TTL:
+        return cached[2:]
+    
+    return _publish_config(config_path, _parse_config(config_path), mtime)
+
+def _publish_config(config_path: str, configs: Dict[str, Dict[str, Any]], mtime: int) -> Tuple[Dict[str, Dict[str, Any]], str, bytes]:
+    """
+    Store a parsed configuration in the cache with its serialized response body and ETag
+    
+    Args:
+        config_path: Path to the configuration file
+        configs: The parsed configuration
+        mtime: Modification time in nanoseconds of the file the configuration was read from
+        
+    Returns:
+        Tuple of the configuration dictionary, its ETag and the serialized response body
+    """
+    # Serialize the response once per load; requests then only send the stored bytes
+    filename = _CONFIG_FILENAMES.get(config_path, os.path.basename(config_path))
+    body = orjson.dumps({"filename": filename, "configs": configs})
+    etag = '"' + hashlib.sha1(body).hexdigest() + '"'
+    # A single assignment, so concurrent readers see either the old or the new entry
+    with _CONFIG_CACHE_LOCK:
+        _CONFIG_CACHE[config_path] = (mtime, time.monotonic(), configs, etag, body)
+    return configs, etag, body
+
+def _preload_configs() -> None:
+    """
+    Parse every configuration file into the cache; a missing or broken file is loaded on first request instead
+    """
+    for config_path in _CONFIG_PATHS.values():
+        try:
+            _load_config_cached(config_path)
+        except Exception as e:
+            print(f"- ERROR - msg_api.py _preload_configs() - Failed to load configuration {config_path}: {e}")
+
+def _watcher_stopped(watcher: asyncio.Task) -> None:
+    """
+    Fall back to the per-request mtime check once the file watcher has stopped
+    
+    Args:
+        watcher: The finished _watch_configs task
+    """
+    global _WATCHING
+    _WATCHING = False
+    if not watcher.cancelled() and watcher.exception() is not None:
+        print(f"- ERROR - msg_api.py _watch_configs() - Configuration watcher stopped: {watcher.exception()}")
+
+async def _watch_configs() -> None:
+    """
+    Reload a configuration file into the cache whenever it changes on disk
+    """
+    async for changes in watchfiles.awatch(CONFIG_DIR):
+        for _, changed_path in changes:
+            config_path = _CONFIG_PATHS.get(os.path.abspath(changed_path))
+            if config_path is None:
+                continue
+            _CONFIG_CACHE.pop(config_path, None)
+            try:
+                _load_config_cached(config_path)
+                print(f"- INFO - msg_api.py _watch_configs() - Configuration reloaded: {config_path}")
+            except Exception as e:
+                print(f"- ERROR - msg_api.py _watch_configs() - Failed to reload configuration {config_path}: {e}")
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    """
+    Check an If-None-Match header against an entity tag, using weak comparison
+    
+    Args:
+        if_none_match: Value of the If-None-Match header, a comma-separated list of entity tags or "*"
+        etag: The current entity tag of the resource
+        
+    Returns:
+        True if any listed tag equals the entity tag, ignoring a W/ prefix, or the header is "*"
+    """
+    for tag in if_none_match.split(","):
+        tag = tag.strip()
+        if tag.startswith("W/"):
+            tag = tag[2:]
+        if tag == "*" or tag == etag:
+            return True
+    return False
+
+def _config_response(config_path: str, request: Request) -> Response:
+    """
+    Build the response for a configuration file from its precomputed body, with caching headers
+    
+    Args:
+        config_path: Path to the configuration file
+        request: The incoming request, checked for a matching If-None-Match header
+        
+    Returns:
+        JSON response with the filename and all configuration sections,
+        or an empty 304 response if the client already has the current version
+    """
+    _, etag, body = _load_config_cached(config_path)
+    headers = {"Cache-Control": f"max-age={CONFIG_CACHE_TTL}", "ETag": etag}
+    if _etag_matches(request.headers.get("if-none-match", ""), etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(
+        content=body,
+        media_type="application/json",
+        headers=headers
+    )
 
 def _save_config(config_path: str, config_data: Dict[str, Dict[str, Any]]) -> None:
     """
@@ -111,15 +363,31 @@ def _save_config(config_path: str, config_data: Dict[str, Dict[str, Any]]) -> No
         for key, value in options.items():
             config[section][key] = str(value)
     
-    # Write the configuration to the file
-    with open(config_path, 'w') as config_file:
-        config.write(config_file)
+    # Write to a temporary file and move it over the original, so readers and the cache
+    # never see a truncated file even if the process dies mid-write
+    tmp_path = f"{config_path}.tmp.{os.getpid()}"
+    try:
+        with open(tmp_path, 'w') as config_file:
+            config.write(config_file)
+            config_file.flush()
+            os.fsync(config_file.fileno())
+        os.replace(tmp_path, config_path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    
+    # Publish the new content right away instead of waiting for the next read to reparse the file
+    _publish_config(config_path, _config_to_dict(config), os.stat(config_path).st_mtime_ns)
 
-@app.get("/config/config_embed", response_model=AllConfigResponse)
-async def get_config_embed():
+@app.get("/config/config_embed", responses={200: {"model": AllConfigResponse}})
+async def get_config_embed(request: Request):
     """
     Get all sections from the embedding configuration file
     
+    Args:
+        request: The incoming request, used for conditional requests via If-None-Match
+    
     Returns:
         AllConfigResponse with all configuration sections from config_embed.ini
     
@@ -142,19 +410,18 @@ async def get_config_embed():
         HTTPException: If there's an error loading the configuration
     """
     try:
-        config = _load_config(CONFIG_EMBED_PATH)
-        return {
-            "filename": "config_embed.ini",
-            "configs": _config_to_dict(config)
-        }
+        return _config_response(CONFIG_EMBED_PATH, request)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error loading embedding configuration: {str(e)}")
 
-@app.get("/config/config_factory", response_model=AllConfigResponse)
-async def get_config_factory():
+@app.get("/config/config_factory", responses={200: {"model": AllConfigResponse}})
+async def get_config_factory(request: Request):
     """
     Get all sections from the factory configuration file
     
+    Args:
+        request: The incoming request, used for conditional requests via If-None-Match
+    
     Returns:
         AllConfigResponse with all configuration sections from config_factory.ini
     
@@ -176,18 +443,16 @@ async def get_config_factory():
         HTTPException: If there's an error loading the configuration
     """
     try:
-        config = _load_config(CONFIG_FACTORY_PATH)
-        return {
-            "filename": "config_factory.ini",
-            "configs": _config_to_dict(config)
-        }
+        return _config_response(CONFIG_FACTORY_PATH, request)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error loading factory configuration: {str(e)}")
 
-@app.get("/config/config_mongodb", response_model=AllConfigResponse)
-async def get_config_mongodb():
+@app.get("/config/config_mongodb", responses={200: {"model": AllConfigResponse}})
+async def get_config_mongodb(request: Request):
     """
     Get MongoDB connection string from the configuration file
+    Args:
+        request: The incoming request, used for conditional requests via If-None-Match
     Returns:
         AllConfigResponse with MongoDB connection string from config_mongodb.ini
     Example Response:
@@ -203,19 +468,18 @@ async def get_config_mongodb():
         HTTPException: If there's an error loading the configuration
     """
     try:
-        config = _load_config(CONFIG_MONGODB_PATH)
-        return {
-            "filename": "config_mongodb.ini",
-            "configs": _config_to_dict(config)
-        }
+        return _config_response(CONFIG_MONGODB_PATH, request)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error loading mongodb configuration: {str(e)}")
 
-@app.get("/config/config_rpa", response_model=AllConfigResponse)
-async def get_config_rpa():
+@app.get("/config/config_rpa", responses={200: {"model": AllConfigResponse}})
+async def get_config_rpa(request: Request):
     """
     Get RPA configuration from the configuration file
     
+    Args:
+        request: The incoming request, used for conditional requests via If-None-Match
+    
     Returns:
         AllConfigResponse with RPA configuration from config_rap.ini
     
@@ -234,11 +498,7 @@ async def get_config_rpa():
         HTTPException: If there's an error loading the configuration
     """
     try:
-        config = _load_config(CONFIG_RAP_PATH)
-        return {
-            "filename": "config_rap.ini",
-            "configs": _config_to_dict(config)
-        }
+        return _config_response(CONFIG_RAP_PATH, request)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error loading RAP configuration: {str(e)}")
 
@@ -272,8 +532,7 @@ async def update_config_embed(request: AllConfigUpdateRequest):
     """
     try:
         # Load existing config
-        config = _load_config(CONFIG_EMBED_PATH)
-        current_config = _config_to_dict(config)
+        current_config = _parse_config(CONFIG_EMBED_PATH)
         
         # Update with new values
         for section, options in request.configs.items():
@@ -282,13 +541,13 @@ async def update_config_embed(request: AllConfigUpdateRequest):
             for key, value in options.items():
                 current_config[section][key] = value
         
-        # Save updated config
-        _save_config(CONFIG_EMBED_PATH, current_config)
+        # Save updated config; the fsync blocks, so keep it off the event loop
+        await run_in_threadpool(_save_config, CONFIG_EMBED_PATH, current_config)
         
-        return {
+        return ORJSONResponse({
             "filename": "config_embed.ini",
             "configs": {"status": "updated successfully" if request.configs else "no changes made"}
-        }
+        })
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, 
@@ -326,8 +585,7 @@ async def update_config_factory(request: AllConfigUpdateRequest):
     """
     try:
         # Load existing config
-        config = _load_config(CONFIG_FACTORY_PATH)
-        current_config = _config_to_dict(config)
+        current_config = _parse_config(CONFIG_FACTORY_PATH)
         
         # Update with new values
         for section, options in request.configs.items():
@@ -336,13 +594,13 @@ async def update_config_factory(request: AllConfigUpdateRequest):
             for key, value in options.items():
                 current_config[section][key] = value
         
-        # Save updated config
-        _save_config(CONFIG_FACTORY_PATH, current_config)
+        # Save updated config; the fsync blocks, so keep it off the event loop
+        await run_in_threadpool(_save_config, CONFIG_FACTORY_PATH, current_config)
         
-        return {
+        return ORJSONResponse({
             "filename": "config_factory.ini",
             "configs": {"status": "updated successfully" if request.configs else "no changes made"}
-        }
+        })
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, 
@@ -351,4 +609,12 @@ async def update_config_factory(request: AllConfigUpdateRequest):
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=10000)
+    # uvloop is not available on Windows, fall back to the default asyncio loop there
+    uvicorn.run(
+        "msg_api:app",
+        host="0.0.0.0",
+        port=10000,
+        workers=int(os.environ.get("WEB_CONCURRENCY", os.cpu_count() or 1)),
+        loop="asyncio" if os.name == "nt" else "uvloop",
+        http="httptools"
+    )
@@ -6,7 +6,9 @@ import os
 from pathlib import Path
 import uvicorn
 from datetime import datetime
-import shutil
+import aiofiles
+import asyncio
+import threading
 
 # Change the working directory to the project root
 os.chdir(os.path.dirname(os.path.abspath(__file__)))
@@ -29,6 +31,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],  # Allows all methods
     allow_headers=["*"],  # Allows all headers
+    max_age=86400,  # Browsers may reuse a preflight result for a day
 )
 
 # Pydantic models for request and response schemas
@@ -44,16 +47,27 @@ class ProcessDocumentRequest(BaseModel):
     collection_name: Optional[str] = Field(default=None, description="Optional custom collection name")
     force_recreate: bool = Field(default=False, description="Whether to recreate the collection if it exists")
 
+# Bytes read from an upload per chunk when saving it to disk
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+
+# Number of server worker processes; each has its own QdrantDocManager, so the embedding
+# provider is only consistent across requests with a single worker
+WEB_CONCURRENCY = int(os.environ.get("WEB_CONCURRENCY", 1))
+
 # Global QdrantDocManager instance
 document_manager = None
+_document_manager_lock = threading.Lock()
 
 def get_document_manager():
     """
     Lazy initialization of the QdrantDocManager
     """
     global document_manager
+    # Double-checked locking: concurrent first calls wait for the one building the manager
     if document_manager is None:
-        document_manager = QdrantDocManager()
+        with _document_manager_lock:
+            if document_manager is None:
+                document_manager = QdrantDocManager()
     return document_manager
 
 
@@ -149,7 +163,7 @@ async def update_embedding_provider(
         ```
         
     Raises:
-        HTTPException: If the update fails
+        HTTPException: If the update fails, or with status 409 if more than one worker is configured
         
     Example CURL:
         ```bash
@@ -173,6 +187,14 @@ async def update_embedding_provider(
             }'
         ```
     """
+    # A switch would only reach the worker process serving this request, and uploads handled by
+    # other workers would keep embedding with the old provider
+    if WEB_CONCURRENCY > 1:
+        raise HTTPException(
+            status_code=409,
+            detail=f"Switching embedding providers is not supported with {WEB_CONCURRENCY} workers; run a single worker or configure the provider instead."
+        )
+    
     dm = get_document_manager()
     
     try:
@@ -456,12 +478,14 @@ async def process_document(
         print(f"Saving file to: {file_path}")
         
         # The crucial step: write the contents of the UploadFile to the new file
-        # Using a sync operation with a thread pool to avoid blocking the event loop
-        with open(file_path, "wb") as buffer:
-            shutil.copyfileobj(file.file, buffer)
+        # Stream it in chunks with async I/O, so a large upload does not block the event loop
+        async with aiofiles.open(file_path, "wb") as buffer:
+            while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+                await buffer.write(chunk)
 
         # Now that the file is saved, you can process it.
-        dm.process_document(file_path=file_path, force_recreate=force_recreate)      
+        # Loading, splitting and embedding block, so run them on a worker thread
+        await asyncio.to_thread(dm.process_document, file_path=file_path, force_recreate=force_recreate)
 
         return {
             "success": True,
@@ -484,16 +508,18 @@ def _list_directory_files(dir_path):
     """
     dir_path.mkdir(exist_ok=True)
     
+    # A single scandir pass; the directory entries already know whether they are files
     files = []
-    for file_path in dir_path.glob("*"):
-        if file_path.is_file():
-            stats = file_path.stat()
-            files.append({
-                "name": file_path.name,
-                "path": str(file_path),
-                "size_bytes": stats.st_size,
-                "last_modified": datetime.fromtimestamp(stats.st_mtime).isoformat()
-            })
+    with os.scandir(dir_path) as entries:
+        for entry in entries:
+            if entry.is_file():
+                stats = entry.stat()
+                files.append({
+                    "name": entry.name,
+                    "path": entry.path,
+                    "size_bytes": stats.st_size,
+                    "last_modified": datetime.fromtimestamp(stats.st_mtime).isoformat()
+                })
     
     return files
 
@@ -555,4 +581,12 @@ async def list_files(directory: str = Query(default="docs", enum=["src", "docs"]
         raise HTTPException(status_code=500, detail=f"Error listing files: {str(e)}")
 
 if __name__ == "__main__":
-    uvicorn.run(app, host="0.0.0.0", port=10009)
+    # uvloop is not available on Windows, fall back to the default asyncio loop there
+    uvicorn.run(
+        "qdrant_api:app",
+        host="0.0.0.0",
+        port=10009,
+        workers=WEB_CONCURRENCY,
+        loop="asyncio" if os.name == "nt" else "uvloop",
+        http="httptools"
+    )
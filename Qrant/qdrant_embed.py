@@ -17,9 +17,11 @@ Configuration is read from config_qdrant_document_manager.ini file
 """
 
 import os
+import sys
 import requests
 from pathlib import Path
-from typing import Dict, Any, Optional
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, Any, List, Optional
 
 # Langchain imports
 from langchain.embeddings.base import Embeddings
@@ -48,6 +50,11 @@ os.chdir(os.path.dirname(os.path.abspath(__file__)))
 # HTTP Endpoint
 CONFIG_URL = "http://localhost:10000/config/config_embed"
 
+# Connections the Qdrant client keeps open; concurrent API requests share the one client
+QDRANT_POOL_SIZE = int(os.environ.get("QDRANT_POOL_SIZE", 32))
+# Seconds a Qdrant request may take; bulk upserts of large documents exceed the client default
+QDRANT_TIMEOUT = 60
+
 class QdrantDocManager:
     """
     A manager class for handling document processing, embedding, and storage in Qdrant.
@@ -73,9 +80,11 @@ class QdrantDocManager:
             config_url (str, optional): URL to fetch configuration from.
                 If provided, fetches configuration from URL instead of file.
         """
+        # Keep-alive session, so configuration refreshes reuse the connection to the Message Center
+        self._session = requests.Session()
         try:
             # Fetch configuration from HTTP endpoint
-            response = requests.get(CONFIG_URL, timeout=5)
+            response = self._session.get(CONFIG_URL, timeout=5)
             if response.status_code == 200:
                 self.config = response.json().get('configs')
                 print(f"✅ Configuration loaded from API: {CONFIG_URL}")
@@ -103,10 +112,7 @@ class QdrantDocManager:
         self.embeddings = self._initialize_embeddings()
         
         # Initialize Qdrant client
-        if self.qdrant_api_key:
-            self.qdrant_client = QdrantClient(self.qdrant_url, api_key=self.qdrant_api_key)
-        else:
-            self.qdrant_client = QdrantClient(self.qdrant_url)
+        self.qdrant_client = self._create_qdrant_client()
         
         # Text splitter for chunking documents
         self.text_splitter = RecursiveCharacterTextSplitter(
@@ -114,6 +120,21 @@ class QdrantDocManager:
             chunk_overlap=self.chunk_overlap,
             length_function=len,
         )
+    
+    def _create_qdrant_client(self) -> QdrantClient:
+        """
+        Create a Qdrant client for the configured server with a connection pool of QDRANT_POOL_SIZE
+        and a timeout long enough for bulk uploads.
+        
+        Returns:
+            QdrantClient: The client for the configured server.
+        """
+        return QdrantClient(
+            url=self.qdrant_url,
+            api_key=self.qdrant_api_key or None,
+            pool_size=QDRANT_POOL_SIZE,
+            timeout=QDRANT_TIMEOUT
+        )
      
     def _initialize_embeddings(self, provider: str = '') -> Embeddings:
         """
@@ -310,10 +331,7 @@ class QdrantDocManager:
                 self.qdrant_api_key = qdrant_api_key
             
             # Create new client with updated settings
-            if self.qdrant_api_key:
-                self.qdrant_client = QdrantClient(url=self.qdrant_url, api_key=self.qdrant_api_key)
-            else:
-                self.qdrant_client = QdrantClient(url=self.qdrant_url)
+            self.qdrant_client = self._create_qdrant_client()
             
             # Test connection
             return self.test_connection()
@@ -359,7 +377,7 @@ class QdrantDocManager:
         """
         try:
             # Fetch configuration from HTTP endpoint
-            response = requests.get(config_url, timeout=5)
+            response = self._session.get(config_url, timeout=5)
             if response.status_code != 200:
                 print(f"❌ Failed to fetch configuration from API: {response.status_code}")
                 return False
@@ -556,7 +574,7 @@ class QdrantDocManager:
             print(f"Error getting point details for {point_id} from collection {collection_name}: {e}")
             return {}
     
-    def process_document(self, file_path: str, force_recreate: bool = False) -> bool:
+    def process_document(self, file_path: str, force_recreate: bool = False, log: Optional[list] = None) -> bool:
         """
         Process a document file and store its embeddings in Qdrant.
         
@@ -570,12 +588,15 @@ class QdrantDocManager:
             file_path (str): Path to the document file
             force_recreate (bool, optional): If True, deletes and recreates 
                 the collection if it exists. Default is False.
+            log (list, optional): If given, progress messages are appended to
+                this list instead of being printed. Default is None.
                 
         Returns:
             bool: True if processing was successful, False otherwise
         """
+        _log = log.append if log is not None else print
         try:
-            print(f"Processing document: {file_path}")
+            _log(f"Processing document: {file_path}")
             
             # Get collection name
             collection_name = self._get_collection_name(file_path)
@@ -584,10 +605,10 @@ class QdrantDocManager:
             collection_exists = self._collection_exists(collection_name)
             
             if collection_exists and not force_recreate:
-                print(f"Collection '{collection_name}' already exists. Updating documents...")
+                _log(f"Collection '{collection_name}' already exists. Updating documents...")
                 return True  # Skip processing if collection exists and not forcing recreation
             elif collection_exists and force_recreate:
-                print(f"Recreating collection '{collection_name}'...")
+                _log(f"Recreating collection '{collection_name}'...")
                 self.qdrant_client.delete_collection(collection_name=collection_name)
                 collection_exists = False
             
@@ -603,7 +624,7 @@ class QdrantDocManager:
             chunks = self.text_splitter.split_documents(documents)
             
             if not chunks:
-                print(f"No content found in document: {file_path}")
+                _log(f"No content found in document: {file_path}")
                 return False
             
             # Get embedding dimensions from the first chunk
@@ -620,39 +641,44 @@ class QdrantDocManager:
                         distance=models.Distance.COSINE
                     ),
                 )
-                print(f"Created collection: {collection_name}")
+                _log(f"Created collection: {collection_name}")
             
-            # Store documents in Qdrant
-            Qdrant.from_documents(
-                documents=chunks,
-                embedding=self.embeddings,
-                url=self.qdrant_url,
+            # Store documents in Qdrant through the shared, pooled client
+            vector_store = Qdrant(
+                client=self.qdrant_client,
                 collection_name=collection_name,
-                api_key=self.qdrant_api_key,
-                force_recreate=False  # We handle recreation manually
+                embeddings=self.embeddings
             )
+            vector_store.add_documents(chunks)
             
-            print(f"Successfully processed document: {file_path}")
-            print(f"Created {len(chunks)} chunks in collection '{collection_name}'")
+            _log(f"Successfully processed document: {file_path}")
+            _log(f"Created {len(chunks)} chunks in collection '{collection_name}'")
             return True
             
         except Exception as e:
-            print(f"Error processing document {file_path}: {e}")
+            _log(f"Error processing document {file_path}: {e}")
             return False
     
-    def process_directory(self, directory_path: str = '', force_recreate: bool = False) -> Dict[str, bool]:
+    def process_directory(self, directory_path: str = '', force_recreate: bool = False, max_workers: Optional[int] = None) -> Dict[str, Any]:
         """
         Process all files in the specified directory by vectorizing and storing them in Qdrant.
-        This method iterates through each file in the given directory, processes each document 
-        using the process_document method, and collects the processing results.
+        This method processes the files in the given directory concurrently on a thread pool
+        using the process_document method, and collects the processing results. Files mapping
+        to different collections are embedded and uploaded independently; files sharing a
+        collection name (e.g. rules.txt and rules.pdf) are processed one after another.
         Parameters:
             directory_path (str): Path to the directory containing files to process.
                                   If not provided, uses the directory from configuration.
             force_recreate (bool): If True, forces re-processing of documents even if they
                                    have been processed before. Default is False.
+            max_workers (int): Maximum number of documents processed at the same time.
+                               Default is the number of CPU cores minus one.
         Returns:
-            Dict[str, bool]: Dictionary mapping file paths to processing success status,
-                             where True indicates successful processing and False indicates failure.
+            Dict[str, Any]: Dictionary with the following keys:
+                - items (Dict[str, bool]): File paths mapped to their processing success status,
+                  where True indicates successful processing and False indicates failure.
+                - success (int): Number of files processed successfully.
+                - failed (int): Number of files that failed.
         Raises:
             Exception: Any exceptions during file processing are caught, logged, and the file is
                        marked as failed in the results.
@@ -660,24 +686,48 @@ class QdrantDocManager:
         if not directory_path:
             directory_path = self.config.get("PROCESSING",0).get("src_directory")
         results = {}
+        success_count = 0
         
         # Get all files in the directory
-        files = [
-            os.path.join(directory_path, f) 
-            for f in os.listdir(directory_path) 
-            if os.path.isfile(os.path.join(directory_path, f))
-        ]
+        with os.scandir(directory_path) as entries:
+            files = [entry.path for entry in entries if entry.is_file()]
+        
+        if not files:
+            return {'items': results, 'success': 0, 'failed': 0}
         
-        # Process each file
+        if max_workers is None:
+            max_workers = (os.cpu_count() or 2) - 1
+        
+        # Files mapping to the same collection are handled serially by one task,
+        # so they never race to create that collection
+        groups: Dict[str, List[str]] = {}
         for file_path in files:
-            try:
-                success = self.process_document(file_path, force_recreate=force_recreate)
-                results[file_path] = success
-            except Exception as e:
-                print(f"Error processing file {file_path}: {e}")
-                results[file_path] = False
+            groups.setdefault(self._get_collection_name(file_path), []).append(file_path)
+        
+        # Each document collects its messages and they are written in one go when its group completes,
+        # so output from concurrent documents does not interleave
+        logs = {file_path: [] for file_path in files}
+        
+        def _process_group(group: List[str]) -> Dict[str, bool]:
+            group_results = {}
+            for file_path in group:
+                try:
+                    group_results[file_path] = self.process_document(file_path, force_recreate=force_recreate, log=logs[file_path])
+                except Exception as e:
+                    logs[file_path].append(f"Error processing file {file_path}: {e}")
+                    group_results[file_path] = False
+            return group_results
+        
+        # Process the groups concurrently, the work is dominated by embedding and Qdrant round trips
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(groups)))) as executor:
+            futures = {executor.submit(_process_group, group): group for group in groups.values()}
+            for future in as_completed(futures):
+                for file_path, success in future.result().items():
+                    results[file_path] = success
+                    success_count += success is True
+                    sys.stdout.write("\n".join(logs[file_path]) + "\n")
         
-        return results
+        return {'items': results, 'success': success_count, 'failed': len(results) - success_count}
 
 
 if __name__ == "__main__":
@@ -707,8 +757,7 @@ if __name__ == "__main__":
 
         dir_results = manager.process_directory(force_recreate=True)
         
-        success_count = sum(1 for result in dir_results.values() if result)
-        print(f"Directory processing results: {success_count}/{len(dir_results)} files processed successfully")
+        print(f"Directory processing results: {dir_results['success']}/{len(dir_results['items'])} files processed successfully")
         
     except Exception as e:
         print(f"❌ Error during testing: {e}")
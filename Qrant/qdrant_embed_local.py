@@ -17,9 +17,11 @@ Configuration is read from config_embed.ini file
 """
 
 import os
+import sys
 import configparser
 from pathlib import Path
-from typing import Dict, Any, Optional
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, Any, List, Optional
 
 # Langchain imports
 from langchain.embeddings.base import Embeddings
@@ -509,7 +511,7 @@ class QdrantDocManager:
             print(f"Error getting point details for {point_id} from collection {collection_name}: {e}")
             return {}
     
-    def process_document(self, file_path: str, force_recreate: bool = False) -> bool:
+    def process_document(self, file_path: str, force_recreate: bool = False, log: Optional[list] = None) -> bool:
         """
         Process a document file and store its embeddings in Qdrant.
         
@@ -523,12 +525,15 @@ class QdrantDocManager:
             file_path (str): Path to the document file
             force_recreate (bool, optional): If True, deletes and recreates 
                 the collection if it exists. Default is False.
+            log (list, optional): If given, progress messages are appended to
+                this list instead of being printed. Default is None.
                 
         Returns:
             bool: True if processing was successful, False otherwise
         """
+        _log = log.append if log is not None else print
         try:
-            print(f"Processing document: {file_path}")
+            _log(f"Processing document: {file_path}")
             
             # Get collection name
             collection_name = self._get_collection_name(file_path)
@@ -537,10 +542,10 @@ class QdrantDocManager:
             collection_exists = self._collection_exists(collection_name)
             
             if collection_exists and not force_recreate:
-                print(f"Collection '{collection_name}' already exists. Updating documents...")
+                _log(f"Collection '{collection_name}' already exists. Updating documents...")
                 return True  # Skip processing if collection exists and not forcing recreation
             elif collection_exists and force_recreate:
-                print(f"Recreating collection '{collection_name}'...")
+                _log(f"Recreating collection '{collection_name}'...")
                 self.qdrant_client.delete_collection(collection_name=collection_name)
                 collection_exists = False
             
@@ -556,7 +561,7 @@ class QdrantDocManager:
             chunks = self.text_splitter.split_documents(documents)
             
             if not chunks:
-                print(f"No content found in document: {file_path}")
+                _log(f"No content found in document: {file_path}")
                 return False
             
             # Get embedding dimensions from the first chunk
@@ -573,7 +578,7 @@ class QdrantDocManager:
                         distance=models.Distance.COSINE
                     ),
                 )
-                print(f"Created collection: {collection_name}")
+                _log(f"Created collection: {collection_name}")
             
             # Store documents in Qdrant
             Qdrant.from_documents(
@@ -585,27 +590,34 @@ class QdrantDocManager:
                 force_recreate=False  # We handle recreation manually
             )
             
-            print(f"Successfully processed document: {file_path}")
-            print(f"Created {len(chunks)} chunks in collection '{collection_name}'")
+            _log(f"Successfully processed document: {file_path}")
+            _log(f"Created {len(chunks)} chunks in collection '{collection_name}'")
             return True
             
         except Exception as e:
-            print(f"Error processing document {file_path}: {e}")
+            _log(f"Error processing document {file_path}: {e}")
             return False
     
-    def process_directory(self, directory_path: str = '', force_recreate: bool = False) -> Dict[str, bool]:
+    def process_directory(self, directory_path: str = '', force_recreate: bool = False, max_workers: Optional[int] = None) -> Dict[str, Any]:
         """
         Process all files in the specified directory by vectorizing and storing them in Qdrant.
-        This method iterates through each file in the given directory, processes each document 
-        using the process_document method, and collects the processing results.
+        This method processes the files in the given directory concurrently on a thread pool
+        using the process_document method, and collects the processing results. Files mapping
+        to different collections are embedded and uploaded independently; files sharing a
+        collection name (e.g. rules.txt and rules.pdf) are processed one after another.
         Parameters:
             directory_path (str): Path to the directory containing files to process.
                                   If not provided, uses the directory from configuration.
             force_recreate (bool): If True, forces re-processing of documents even if they
                                    have been processed before. Default is False.
+            max_workers (int): Maximum number of documents processed at the same time.
+                               Default is the number of CPU cores minus one.
         Returns:
-            Dict[str, bool]: Dictionary mapping file paths to processing success status,
-                             where True indicates successful processing and False indicates failure.
+            Dict[str, Any]: Dictionary with the following keys:
+                - items (Dict[str, bool]): File paths mapped to their processing success status,
+                  where True indicates successful processing and False indicates failure.
+                - success (int): Number of files processed successfully.
+                - failed (int): Number of files that failed.
         Raises:
             Exception: Any exceptions during file processing are caught, logged, and the file is
                        marked as failed in the results.
@@ -613,24 +625,48 @@ class QdrantDocManager:
         if not directory_path:
             directory_path = self.config.get("PROCESSING", "src_directory")
         results = {}
+        success_count = 0
         
         # Get all files in the directory
-        files = [
-            os.path.join(directory_path, f) 
-            for f in os.listdir(directory_path) 
-            if os.path.isfile(os.path.join(directory_path, f))
-        ]
+        with os.scandir(directory_path) as entries:
+            files = [entry.path for entry in entries if entry.is_file()]
         
-        # Process each file
+        if not files:
+            return {'items': results, 'success': 0, 'failed': 0}
+        
+        if max_workers is None:
+            max_workers = (os.cpu_count() or 2) - 1
+        
+        # Files mapping to the same collection are handled serially by one task,
+        # so they never race to create that collection
+        groups: Dict[str, List[str]] = {}
         for file_path in files:
-            try:
-                success = self.process_document(file_path, force_recreate=force_recreate)
-                results[file_path] = success
-            except Exception as e:
-                print(f"Error processing file {file_path}: {e}")
-                results[file_path] = False
+            groups.setdefault(self._get_collection_name(file_path), []).append(file_path)
+        
+        # Each document collects its messages and they are written in one go when its group completes,
+        # so output from concurrent documents does not interleave
+        logs = {file_path: [] for file_path in files}
+        
+        def _process_group(group: List[str]) -> Dict[str, bool]:
+            group_results = {}
+            for file_path in group:
+                try:
+                    group_results[file_path] = self.process_document(file_path, force_recreate=force_recreate, log=logs[file_path])
+                except Exception as e:
+                    logs[file_path].append(f"Error processing file {file_path}: {e}")
+                    group_results[file_path] = False
+            return group_results
+        
+        # Process the groups concurrently, the work is dominated by embedding and Qdrant round trips
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(groups)))) as executor:
+            futures = {executor.submit(_process_group, group): group for group in groups.values()}
+            for future in as_completed(futures):
+                for file_path, success in future.result().items():
+                    results[file_path] = success
+                    success_count += success is True
+                    sys.stdout.write("\n".join(logs[file_path]) + "\n")
         
-        return results
+        return {'items': results, 'success': success_count, 'failed': len(results) - success_count}
 
 
 if __name__ == "__main__":
@@ -659,8 +695,7 @@ if __name__ == "__main__":
 
         dir_results = manager.process_directory(force_recreate=False)
         
-        success_count = sum(1 for result in dir_results.values() if result)
-        print(f"Directory processing results: {success_count}/{len(dir_results)} files processed successfully")
+        print(f"Directory processing results: {dir_results['success']}/{len(dir_results['items'])} files processed successfully")
         
     except Exception as e:
         print(f"❌ Error during testing: {e}")